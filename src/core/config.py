@@ -27,10 +27,13 @@ class Settings(BaseSettings):
     # LLM Configuration
     llm_provider: str = "gemini"  # Options: "gemini", "openai"
     llm_fallback_enabled: bool = True  # Enable fallback to other provider on exhaustion
+    llm_hedge_enabled: bool = False  # Race a second Gemini key when a call is slow
+    llm_hedge_delay_seconds: float = 8.0  # Wait before sending the hedged request
 
     # Gemini Configuration (supports comma-separated keys for rotation)
     gemini_api_key: str = ""
     gemini_model: str = "gemini-2.0-flash"
+    gemini_final_model: str = ""  # Forced final Reply Agent answer; empty = gemini_model
 
     @property
     def gemini_api_keys(self) -> list[str]:
@@ -42,6 +45,7 @@ class Settings(BaseSettings):
     # OpenAI Configuration
     openai_api_key: str = ""
     openai_model: str = "gpt-4o-mini"
+    openai_final_model: str = ""  # Forced final Reply Agent answer; empty = openai_model
 
     # OpenRouter Fallback Configuration
     openrouter_api_key: str = ""
@@ -52,6 +56,11 @@ class Settings(BaseSettings):
     google_search_engine_id: str = ""
     reply_agent_enabled: bool = True
 
+    # Reply Agent - Semantic response cache (embeds each text-only prompt)
+    semantic_cache_enabled: bool = False
+    semantic_cache_embedding_model: str = "openai/text-embedding-3-small"
+    semantic_cache_threshold: float = 0.92  # Min cosine similarity for a hit
+
     # Mandarin Generator - Recipients (comma-separated JIDs)
     whatsapp_recipients: str = ""
 
@@ -70,6 +79,12 @@ class Settings(BaseSettings):
 
     # Concurrency Configuration
     max_concurrent_sends: int = 5  # Max parallel message sends
+    openai_max_concurrency: int = 16  # Max parallel Reply Agent calls per provider
+    gemini_max_concurrency: int = 32
+    openrouter_max_concurrency: int = 16
+
+    # Idempotency tracking database (SQLite, persisted across restarts)
+    idempotency_db_path: str = "data/idempotency.db"
 
     # Chat Summarizer Configuration
     chat_summarizer_enabled: bool = True
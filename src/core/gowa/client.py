@@ -40,14 +40,30 @@ class GowaClient:
             username or settings.gowa_username,
             password or settings.gowa_password,
         )
+        self._client: Optional[httpx.AsyncClient] = None
 
     def _get_client(self) -> httpx.AsyncClient:
-        """Create an async HTTP client with authentication."""
-        return httpx.AsyncClient(
-            base_url=self.base_url,
-            auth=self.auth,
-            timeout=30.0,
-        )
+        """
+        Get the shared async HTTP client with authentication.
+
+        The client is created on first use and reused for every call, so
+        keep-alive connections to GoWA are pooled instead of reconnecting
+        per message. GoWA has no batch send endpoint, so this is where
+        per-send overhead is cut.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                auth=self.auth,
+                timeout=30.0,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     @retry(
         stop=stop_after_attempt(3),
@@ -61,7 +77,7 @@ class GowaClient:
         reply_message_id: Optional[str] = None,
     ) -> dict:
         """
-        Send a text message via WhatsApp.
+        Send a text message via WhatsApp, retrying HTTP and connection errors.
 
         Args:
             phone: Recipient JID (e.g., "6289685028129@s.whatsapp.net")
@@ -74,6 +90,32 @@ class GowaClient:
         Raises:
             GowaClientError: If the message fails to send
         """
+        return await self.send_message_once(phone, message, reply_message_id)
+
+    async def send_message_once(
+        self,
+        phone: str,
+        message: str,
+        reply_message_id: Optional[str] = None,
+    ) -> dict:
+        """
+        Send a text message via WhatsApp in a single attempt.
+
+        For callers that apply their own retry policy (see send_message for
+        the retrying variant).
+
+        Args:
+            phone: Recipient JID (e.g., "6289685028129@s.whatsapp.net")
+            message: Message content
+            reply_message_id: Optional message ID to reply to
+
+        Returns:
+            Response dict with message_id and status
+
+        Raises:
+            GowaClientError: If GoWA rejects the message
+            httpx.HTTPError: If the request fails
+        """
         payload = {
             "phone": phone,
             "message": message,
@@ -81,18 +123,18 @@ class GowaClient:
         if reply_message_id:
             payload["reply_message_id"] = reply_message_id
 
-        async with self._get_client() as client:
-            response = await client.post("/send/message", json=payload)
-            response.raise_for_status()
-            data = response.json()
+        client = self._get_client()
+        response = await client.post("/send/message", json=payload)
+        response.raise_for_status()
+        data = response.json()
 
-            if data.get("code") != "SUCCESS":
-                raise GowaClientError(f"Failed to send message: {data}")
+        if data.get("code") != "SUCCESS":
+            raise GowaClientError(f"Failed to send message: {data}")
 
-            logger.info(
-                f"Message sent successfully to {phone}: {data['results']['message_id']}"
-            )
-            return data["results"]
+        logger.info(
+            f"Message sent successfully to {phone}: {data['results']['message_id']}"
+        )
+        return data["results"]
 
     async def check_health(self) -> bool:
         """
@@ -102,9 +144,9 @@ class GowaClient:
             True if service is healthy, False otherwise
         """
         try:
-            async with self._get_client() as client:
-                response = await client.get("/app/devices")
-                return response.status_code == 200
+            client = self._get_client()
+            response = await client.get("/app/devices")
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"GoWA health check failed: {e}")
             return False
@@ -116,11 +158,11 @@ class GowaClient:
         Returns:
             List of device information dicts
         """
-        async with self._get_client() as client:
-            response = await client.get("/app/devices")
-            response.raise_for_status()
-            data = response.json()
-            return data.get("results", [])
+        client = self._get_client()
+        response = await client.get("/app/devices")
+        response.raise_for_status()
+        data = response.json()
+        return data.get("results", [])
 
     @retry(
         stop=stop_after_attempt(2),
@@ -144,42 +186,42 @@ class GowaClient:
         Raises:
             GowaClientError: If media download fails or message has no media
         """
-        async with self._get_client() as client:
-            response = await client.get(
-                f"/message/{message_id}/download",
-                params={"phone": phone},
-            )
-            response.raise_for_status()
-
-            # Get MIME type from Content-Type header
-            content_type = response.headers.get("Content-Type", "application/octet-stream")
-            # Strip any charset or parameters (e.g., "image/jpeg; charset=utf-8" -> "image/jpeg")
-            mime_type = content_type.split(";")[0].strip()
-
-            # GoWA returns JSON instead of binary in two cases:
-            # 1. Error - no downloadable media
-            # 2. Success - media was auto-downloaded to disk, returns file path
-            if mime_type == "application/json":
-                try:
-                    json_data = response.json()
-                    message = json_data.get("message", "")
-
-                    # Check if it's a success response with file path
-                    # Format: "Media downloaded successfully to statics/media/..."
-                    if "downloaded successfully to" in message:
-                        # Extract file path from message
-                        file_path = message.split("downloaded successfully to ")[-1].strip()
-                        logger.info(f"Media was auto-downloaded, fetching from path: {file_path}")
-                        # Fetch the file from the static path
-                        return await self.download_media_from_path(file_path)
-
-                    # Otherwise it's an error
-                    raise GowaClientError(f"No downloadable media: {message}")
-                except (ValueError, KeyError) as e:
-                    raise GowaClientError(f"No downloadable media in message: {e}")
-
-            logger.info(f"Downloaded media from message {message_id}: {mime_type}, {len(response.content)} bytes")
-            return response.content, mime_type
+        client = self._get_client()
+        response = await client.get(
+            f"/message/{message_id}/download",
+            params={"phone": phone},
+        )
+        response.raise_for_status()
+
+        # Get MIME type from Content-Type header
+        content_type = response.headers.get("Content-Type", "application/octet-stream")
+        # Strip any charset or parameters (e.g., "image/jpeg; charset=utf-8" -> "image/jpeg")
+        mime_type = content_type.split(";")[0].strip()
+
+        # GoWA returns JSON instead of binary in two cases:
+        # 1. Error - no downloadable media
+        # 2. Success - media was auto-downloaded to disk, returns file path
+        if mime_type == "application/json":
+            try:
+                json_data = response.json()
+                message = json_data.get("message", "")
+
+                # Check if it's a success response with file path
+                # Format: "Media downloaded successfully to statics/media/..."
+                if "downloaded successfully to" in message:
+                    # Extract file path from message
+                    file_path = message.split("downloaded successfully to ")[-1].strip()
+                    logger.info(f"Media was auto-downloaded, fetching from path: {file_path}")
+                    # Fetch the file from the static path
+                    return await self.download_media_from_path(file_path)
+
+                # Otherwise it's an error
+                raise GowaClientError(f"No downloadable media: {message}")
+            except (ValueError, KeyError) as e:
+                raise GowaClientError(f"No downloadable media in message: {e}")
+
+        logger.info(f"Downloaded media from message {message_id}: {mime_type}, {len(response.content)} bytes")
+        return response.content, mime_type
 
     @retry(
         stop=stop_after_attempt(2),
@@ -202,19 +244,19 @@ class GowaClient:
         Raises:
             GowaClientError: If media download fails
         """
-        async with self._get_client() as client:
-            # GoWA serves static files at the root path
-            response = await client.get(f"/{file_path}")
-            response.raise_for_status()
+        client = self._get_client()
+        # GoWA serves static files at the root path
+        response = await client.get(f"/{file_path}")
+        response.raise_for_status()
 
-            content_type = response.headers.get("Content-Type", "application/octet-stream")
-            mime_type = content_type.split(";")[0].strip()
+        content_type = response.headers.get("Content-Type", "application/octet-stream")
+        mime_type = content_type.split(";")[0].strip()
 
-            if mime_type == "application/json":
-                raise GowaClientError(f"Failed to download media from path: {file_path}")
+        if mime_type == "application/json":
+            raise GowaClientError(f"Failed to download media from path: {file_path}")
 
-            logger.info(f"Downloaded media from path {file_path}: {mime_type}, {len(response.content)} bytes")
-            return response.content, mime_type
+        logger.info(f"Downloaded media from path {file_path}: {mime_type}, {len(response.content)} bytes")
+        return response.content, mime_type
 
     async def get_chat_messages(
         self, chat_jid: str, limit: int = 50
@@ -268,21 +310,21 @@ class GowaClient:
         self, chat_jid: str, limit: int, offset: int = 0
     ) -> list[dict]:
         """Fetch a single page of messages from GoWA."""
-        async with self._get_client() as client:
-            response = await client.get(
-                f"/chat/{chat_jid}/messages",
-                params={"limit": limit, "offset": offset},
-            )
-            response.raise_for_status()
-            data = response.json()
+        client = self._get_client()
+        response = await client.get(
+            f"/chat/{chat_jid}/messages",
+            params={"limit": limit, "offset": offset},
+        )
+        response.raise_for_status()
+        data = response.json()
 
-            if data.get("code") != "SUCCESS":
-                raise GowaClientError(f"Failed to fetch messages: {data}")
+        if data.get("code") != "SUCCESS":
+            raise GowaClientError(f"Failed to fetch messages: {data}")
 
-            results = data.get("results", {})
-            messages = results.get("data", []) if isinstance(results, dict) else []
-            logger.info(f"Fetched {len(messages)} messages from {chat_jid} (offset={offset})")
-            return messages
+        results = data.get("results", {})
+        messages = results.get("data", []) if isinstance(results, dict) else []
+        logger.info(f"Fetched {len(messages)} messages from {chat_jid} (offset={offset})")
+        return messages
 
     @retry(
         stop=stop_after_attempt(2),
@@ -302,18 +344,18 @@ class GowaClient:
         Raises:
             GowaClientError: If fetch fails
         """
-        async with self._get_client() as client:
-            response = await client.get(
-                "/user/info",
-                params={"phone": phone_jid},
-            )
-            response.raise_for_status()
-            data = response.json()
+        client = self._get_client()
+        response = await client.get(
+            "/user/info",
+            params={"phone": phone_jid},
+        )
+        response.raise_for_status()
+        data = response.json()
 
-            if data.get("code") != "SUCCESS":
-                raise GowaClientError(f"Failed to get user info: {data}")
+        if data.get("code") != "SUCCESS":
+            raise GowaClientError(f"Failed to get user info: {data}")
 
-            return data.get("results", {})
+        return data.get("results", {})
 
 
 # Singleton instance for dependency injection
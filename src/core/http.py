@@ -0,0 +1,75 @@
+"""Shared HTTP client for outbound API calls (LLM providers and web search)."""
+
+import asyncio
+import logging
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# One pool for every outbound API, so connections to overlapping hosts
+# are reused instead of each SDK keeping its own pool
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=400)
+HTTP_TIMEOUT = httpx.Timeout(45.0, connect=5.0)
+
+# Connection attempts that fail (refused, reset, connect timeout) are retried
+# once at the transport level; requests that reached the server never are
+HTTP_CONNECT_RETRIES = 1
+
+# Redirect chains longer than this fail instead of being followed
+HTTP_MAX_REDIRECTS = 5
+
+# Hosts the app talks to on the hot path; connected at startup so the first
+# user request doesn't pay DNS + TCP + TLS setup
+PREWARM_URLS = (
+    "https://openrouter.ai/api/v1",
+    "https://generativelanguage.googleapis.com",
+    "https://www.googleapis.com",
+)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide async HTTP client.
+
+    Created on first use; the OpenAI and Gemini SDK clients and the web
+    search tool all share it.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        # Limits belong to the transport once one is passed explicitly
+        transport = httpx.AsyncHTTPTransport(
+            limits=HTTP_LIMITS, retries=HTTP_CONNECT_RETRIES
+        )
+        _client = httpx.AsyncClient(
+            transport=transport,
+            timeout=HTTP_TIMEOUT,
+            max_redirects=HTTP_MAX_REDIRECTS,
+        )
+    return _client
+
+
+async def prewarm_connections() -> None:
+    """Open keep-alive connections to the hot-path API hosts.
+
+    Failures are only logged; a cold connection just means the first real
+    request sets it up as before.
+    """
+    client = get_http_client()
+    results = await asyncio.gather(
+        *(client.head(url, timeout=5.0) for url in PREWARM_URLS),
+        return_exceptions=True,
+    )
+    for url, result in zip(PREWARM_URLS, results):
+        if isinstance(result, Exception):
+            logger.debug(f"Pre-warming {url} failed: {result}")
+    logger.info(f"Pre-warmed connections to {len(PREWARM_URLS)} API hosts")
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (call on application shutdown)."""
+    if _client is not None:
+        await _client.aclose()
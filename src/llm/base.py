@@ -1,12 +1,114 @@
 """Unified LLM interface for provider switching."""
 
+import asyncio
 import logging
+import re
 from typing import Optional, Protocol
 
+import httpx
+import openai
+
 from src.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Error message markers that warrant rotating keys or falling back to another provider
+FALLBACK_ERROR_PATTERN = re.compile(
+    # Rate limit / quota errors
+    r"429|quota|rate|exhausted|all api keys"
+    # Invalid/expired API key errors
+    r"|api_key_invalid|api key expired|invalid_argument|invalid api key"
+    # Server overload / unavailable errors
+    r"|503|500|unavailable|overload|internal error",
+    re.IGNORECASE,
+)
+
+
+# HTTP status codes that warrant rotating keys or falling back to another provider
+FALLBACK_STATUS_CODES = frozenset({401, 403, 429, 500, 502, 503, 504})
+
+# Gemini reports invalid/expired API keys as 400 INVALID_ARGUMENT, so a 400
+# still needs its message checked
+AMBIGUOUS_STATUS_CODES = frozenset({400})
+
+
+def get_status_code(error: Exception) -> Optional[int]:
+    """
+    Get the HTTP status code an LLM error carries, if any.
+
+    Covers OpenAI (status_code), google-genai (code) and httpx
+    (response.status_code) errors.
+    """
+    for code in (
+        getattr(error, "status_code", None),
+        getattr(error, "code", None),
+        getattr(getattr(error, "response", None), "status_code", None),
+    ):
+        if isinstance(code, int):
+            return code
+    return None
+
+
+def is_fallback_worthy_error(error: Exception | str) -> bool:
+    """
+    Check if an LLM error warrants trying another key or provider.
+
+    Exceptions carrying an HTTP status code are classified by the code; the
+    message is only scanned when there is no (unambiguous) code. Accepts an
+    already-stringified message for errors that have no code.
+    """
+    if isinstance(error, Exception):
+        code = get_status_code(error)
+        if code is not None and code not in AMBIGUOUS_STATUS_CODES:
+            return code in FALLBACK_STATUS_CODES
+    message = error if isinstance(error, str) else str(error)
+    return FALLBACK_ERROR_PATTERN.search(message) is not None
+
+
+# Timeouts and failed connections; SDK retries are disabled, so these reach
+# the caller on the first failure
+CONNECTION_ERROR_TYPES = (
+    openai.APIConnectionError,  # Includes openai.APITimeoutError
+    httpx.TransportError,  # Includes httpx.TimeoutException
+    asyncio.TimeoutError,
+)
+
+
+def is_connection_error(error: Exception) -> bool:
+    """Check if an LLM call failed by timing out or not connecting at all."""
+    return isinstance(error, CONNECTION_ERROR_TYPES)
+
+
+# Transient rate limit markers; worth retrying the same provider after a backoff
+RATE_LIMIT_ERROR_PATTERN = re.compile(r"429|rate|quota", re.IGNORECASE)
+
+
+def is_rate_limit_error(error: Exception | str) -> bool:
+    """Check if an LLM error looks like a (possibly transient) rate limit."""
+    if isinstance(error, Exception):
+        code = get_status_code(error)
+        if code is not None:
+            return code == 429
+    message = error if isinstance(error, str) else str(error)
+    return RATE_LIMIT_ERROR_PATTERN.search(message) is not None
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """
+    Get the Retry-After delay in seconds from an error's HTTP response.
+
+    Returns:
+        Delay in seconds, or None if the error exposes no usable header
+        (HTTP-date values are ignored)
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return max(0.0, float(headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return None
+
 
 class LLMClient(Protocol):
     """Protocol for LLM clients."""
@@ -7,6 +7,7 @@ from google.genai import types
 from google.genai.errors import ClientError
 
 from src.core.config import settings
+from src.llm.base import is_fallback_worthy_error
 from src.llm.key_rotator import gemini_key_rotator
 
 logger = logging.getLogger(__name__)
@@ -65,7 +66,7 @@ class GeminiClient:
             contents = prompt
 
         # Try each key once before giving up
-        num_keys = len(self._rotator._keys)
+        num_keys = self._rotator.num_keys
         last_error: Optional[Exception] = None
 
         for attempt in range(num_keys):
@@ -82,29 +83,8 @@ class GeminiClient:
                 return text
 
             except ClientError as e:
-                error_str = str(e).lower()
                 # Check if error warrants trying next key
-                is_rotatable_error = (
-                    # Rate limit / quota errors
-                    "429" in str(e)
-                    or "quota" in error_str
-                    or "rate" in error_str
-                    or "exhausted" in error_str
-                    or "all api keys" in error_str
-                    # Invalid/expired API key errors
-                    or "api_key_invalid" in error_str
-                    or "api key expired" in error_str
-                    or "invalid_argument" in error_str
-                    or "invalid api key" in error_str
-                    # SERVER OVERLOAD / UNAVAILABLE ERRORS
-                    or "503" in str(e)
-                    or "500" in error_str
-                    or "unavailable" in error_str
-                    or "overload" in error_str
-                    or "overloaded" in error_str
-                    or "internal error" in error_str
-                    or "temporarily unavailable" in error_str
-                )
+                is_rotatable_error = is_fallback_worthy_error(e)
 
                 if is_rotatable_error:
                     last_error = e
@@ -5,8 +5,10 @@ import threading
 from typing import Optional
 
 from google import genai
+from google.genai import types
 
 from src.core.config import settings
+from src.core.http import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -26,10 +28,16 @@ class GeminiKeyRotator:
 
         self._current_index = 0
         self._lock = threading.Lock()
-        self._clients: dict[str, genai.Client] = {}
+        # One client per key (by index), created on first use and then reused
+        self._clients: list[Optional[genai.Client]] = [None] * len(self._keys)
 
         logger.info(f"GeminiKeyRotator initialized with {len(self._keys)} API key(s)")
 
+    @property
+    def num_keys(self) -> int:
+        """Number of configured API keys."""
+        return len(self._keys)
+
     @property
     def current_key(self) -> str:
         """Get the current API key."""
@@ -51,16 +59,37 @@ class GeminiKeyRotator:
             )
             return self._keys[self._current_index]
 
+    def _client_at(self, index: int) -> genai.Client:
+        """Get (creating if needed) the client for a key index; lock held."""
+        client = self._clients[index]
+        if client is None:
+            client = genai.Client(
+                api_key=self._keys[index],
+                # Shared pool; also keeps genai off its default aiohttp
+                # transport and that transport's low per-host limit
+                http_options=types.HttpOptions(httpx_async_client=get_http_client()),
+            )
+            self._clients[index] = client
+        return client
+
     def get_client(self) -> genai.Client:
         """
         Get a Gemini client for the current API key.
 
-        Clients are cached per key to avoid recreation overhead.
+        Clients are cached per key to avoid recreation overhead, so
+        rotating only flips an index.
+        """
+        with self._lock:
+            return self._client_at(self._current_index)
+
+    def peek_next_client(self) -> genai.Client:
         """
-        key = self.current_key
-        if key not in self._clients:
-            self._clients[key] = genai.Client(api_key=key)
-        return self._clients[key]
+        Get the client for the key after the current one, without rotating.
+
+        For side requests (e.g. hedging) that must not move the shared index.
+        """
+        with self._lock:
+            return self._client_at((self._current_index + 1) % len(self._keys))
 
     def get_next_client(self) -> genai.Client:
         """
@@ -15,6 +15,7 @@ from fastapi import FastAPI, Request, HTTPException
 from pydantic import BaseModel
 
 from src.core.config import settings
+from src.core.http import close_http_client, prewarm_connections
 from src.core.logging import setup_logging
 from src.core.scheduler import start_scheduler, shutdown_scheduler, scheduler
 from src.core.gowa import gowa_client
@@ -85,10 +86,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Startup
     logger.info(f"Starting {settings.app_name}...")
     start_scheduler()
+    # Warm API connections in the background so startup isn't delayed
+    prewarm_task = asyncio.create_task(prewarm_connections())
     yield
     # Shutdown
     logger.info("Shutting down...")
+    prewarm_task.cancel()
     shutdown_scheduler()
+    await gowa_client.aclose()
+    await close_http_client()
 
 
 app = FastAPI(
@@ -435,11 +441,9 @@ async def handle_webhook(request: Request) -> dict:
             settings.chat_summarizer_enabled
             and event_type == "message.text"
             and message_text
-            and chat_summarizer.should_trigger(message_text)
+            and (message_count := chat_summarizer.parse(message_text)) is not None
         ):
-            message_count = chat_summarizer.extract_message_count(message_text)
-
-            if message_count is not None and message_count > 0:
+            if message_count > 0:
                 # Extract reply JID - handle group messages
                 reply_jid = sender_jid
                 if " in " in sender_jid:
@@ -16,19 +16,24 @@ class ChatSummarizerService:
 
     # Case-insensitive trigger pattern
     # Matches: "akasha, summarize the previous 50 messages"
-    # Also allows trailing whitespace and punctuation (.!?)
+    # Also allows surrounding whitespace and trailing punctuation (.!?)
     TRIGGER_PATTERN = re.compile(
-        r"^akasha,\s*summarize\s+the\s+previous\s+(\d+)\s+messages?\s*[.!?]*\s*$",
+        r"^\s*akasha,\s*summarize\s+the\s+previous\s+(\d+)\s+messages?\s*[.!?]*\s*$",
         re.IGNORECASE,
     )
 
-    def should_trigger(self, message: str) -> bool:
-        """Check if message matches the summarize command."""
-        return bool(self.TRIGGER_PATTERN.match(message.strip()))
+    def parse(self, message: str) -> Optional[int]:
+        """
+        Match the summarize command and extract the requested message count.
+
+        Args:
+            message: Incoming message text
 
-    def extract_message_count(self, message: str) -> Optional[int]:
-        """Extract the requested number of messages from command."""
-        match = self.TRIGGER_PATTERN.match(message.strip())
+        Returns:
+            Requested number of messages (capped at the configured maximum),
+            or None if the message is not a summarize command
+        """
+        match = self.TRIGGER_PATTERN.match(message)
         if match:
             count = int(match.group(1))
             # Enforce maximum limit
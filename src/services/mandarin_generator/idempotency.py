@@ -0,0 +1,133 @@
+"""Durable idempotency tracking for Mandarin Generator sends."""
+
+import asyncio
+import logging
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Optional
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Entries older than this are deleted when the store is first opened, then
+# again on a flush at most once per PURGE_INTERVAL_SECONDS
+RETENTION_DAYS = 7
+PURGE_INTERVAL_SECONDS = 86400
+
+# Successful sends are buffered and written in batches to amortize commits
+WRITE_BATCH_SIZE = 10
+
+
+class IdempotencyStore:
+    """
+    SQLite-backed record of which recipients received a given send.
+
+    Survives process restarts, so a scheduler retry after a crash does not
+    resend to recipients who already got today's passage. SQLite calls run
+    in a worker thread to keep the event loop free.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or settings.idempotency_db_path
+        self._pending: list[tuple[str, str, float]] = []
+        self._lock = asyncio.Lock()
+        self._initialized = False
+        self._last_purge = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the database directory if needed."""
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        return sqlite3.connect(self.db_path)
+
+    @staticmethod
+    def _purge(conn: sqlite3.Connection) -> int:
+        """Delete entries past the retention window. Returns rows deleted."""
+        cutoff = time.time() - RETENTION_DAYS * 86400
+        return conn.execute("DELETE FROM sent WHERE sent_at < ?", (cutoff,)).rowcount
+
+    def _init_db(self) -> int:
+        """Create the table and drop expired entries. Returns rows deleted."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sent ("
+                "key TEXT NOT NULL, "
+                "recipient TEXT NOT NULL, "
+                "sent_at REAL NOT NULL, "
+                "PRIMARY KEY (key, recipient))"
+            )
+            return self._purge(conn)
+
+    def _select(self, key: str) -> set[str]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT recipient FROM sent WHERE key = ?", (key,))
+            return {row[0] for row in rows}
+
+    def _insert(self, entries: list[tuple[str, str, float]], purge: bool) -> int:
+        """Write entries (and optionally purge expired ones) in one transaction."""
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("INSERT OR IGNORE INTO sent VALUES (?, ?, ?)", entries)
+            return self._purge(conn) if purge else 0
+
+    async def _ensure_initialized(self) -> None:
+        """Initialize the database on first use (caller holds the lock)."""
+        if not self._initialized:
+            deleted = await asyncio.to_thread(self._init_db)
+            self._initialized = True
+            self._last_purge = time.monotonic()
+            if deleted:
+                logger.debug(f"Cleaned up {deleted} old idempotency entries")
+
+    async def already_sent(self, key: str) -> set[str]:
+        """
+        Get recipients already sent to for an idempotency key.
+
+        Args:
+            key: Idempotency key (e.g., "daily_passage_2026-01-09")
+
+        Returns:
+            Set of recipient JIDs, including buffered not-yet-written sends
+        """
+        async with self._lock:
+            await self._ensure_initialized()
+            recipients = await asyncio.to_thread(self._select, key)
+            recipients.update(r for k, r, _ in self._pending if k == key)
+            return recipients
+
+    async def mark_sent(self, key: str, recipient: str) -> None:
+        """
+        Record a successful send.
+
+        Writes are buffered and flushed every WRITE_BATCH_SIZE entries;
+        call flush() once a send run completes.
+        """
+        async with self._lock:
+            self._pending.append((key, recipient, time.time()))
+            if len(self._pending) >= WRITE_BATCH_SIZE:
+                await self._flush_locked()
+
+    async def flush(self) -> None:
+        """Write any buffered sends to the database."""
+        async with self._lock:
+            await self._flush_locked()
+
+    async def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        await self._ensure_initialized()
+        # Long-running processes only open the store once, so purge here too
+        purge = time.monotonic() - self._last_purge >= PURGE_INTERVAL_SECONDS
+        # Entries are dropped from the buffer only once their write commits;
+        # on failure they stay buffered for the next flush
+        deleted = await asyncio.to_thread(self._insert, list(self._pending), purge)
+        self._pending.clear()
+        if purge:
+            self._last_purge = time.monotonic()
+            if deleted:
+                logger.debug(f"Cleaned up {deleted} old idempotency entries")
+
+
+# Singleton instance
+idempotency_store = IdempotencyStore()
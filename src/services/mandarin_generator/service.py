@@ -4,6 +4,7 @@ import logging
 import random
 import re
 from datetime import date
+from itertools import islice
 from typing import Optional
 
 from src.core.config import settings
@@ -16,6 +17,18 @@ logger = logging.getLogger(__name__)
 MESSAGE_HEADER_TEMPLATE = "📚 每日中文阅读 - {date}"
 
 
+# Chinese characters (CJK Unified Ideographs) counted towards passage length
+CJK_CHAR_PATTERN = re.compile(r"[\u4e00-\u9fff]")
+
+# Chinese punctuation marking the end of a sentence
+SENTENCE_ENDINGS = ("。", "！", "？")
+
+
+def count_chinese_chars(text: str) -> int:
+    """Count Chinese characters in text (single regex pass, no per-char loop)."""
+    return len(CJK_CHAR_PATTERN.findall(text))
+
+
 def get_formatted_date() -> str:
     """Get today's date formatted for Mandarin passages (YYYY年MM月DD日)."""
     return date.today().strftime("%Y年%m月%d日")
@@ -72,7 +85,7 @@ class PassageGeneratorService:
     # which is desirable for educational content that should feel fresh each day
     GENERATION_TEMPERATURE = 0.9
 
-    def _validate_and_fix_length(self, passage: str) -> tuple[str, bool]:
+    def _validate_and_fix_length(self, passage: str) -> tuple[str, bool, int]:
         """
         Validate passage length and truncate if too long.
 
@@ -80,17 +93,18 @@ class PassageGeneratorService:
             passage: The generated passage
 
         Returns:
-            Tuple of (fixed_passage, is_valid) where is_valid indicates
-            if the passage meets minimum length requirement
+            Tuple of (fixed_passage, is_valid, chinese_chars) where is_valid
+            indicates if the passage meets minimum length requirement and
+            chinese_chars is the Chinese character count of fixed_passage
         """
         # Count only Chinese characters for length validation
-        chinese_chars = len([c for c in passage if "\u4e00" <= c <= "\u9fff"])
+        chinese_chars = count_chinese_chars(passage)
 
         if chinese_chars < self.MIN_LENGTH:
             logger.warning(
                 f"Passage too short: {chinese_chars} Chinese chars (min: {self.MIN_LENGTH})"
             )
-            return passage, False
+            return passage, False, chinese_chars
 
         if chinese_chars > self.MAX_LENGTH:
             logger.warning(
@@ -98,27 +112,19 @@ class PassageGeneratorService:
             )
             # Truncate at sentence boundary (。！？)
             passage = self._truncate_at_sentence(passage, self.MAX_LENGTH)
+            chinese_chars = count_chinese_chars(passage)
 
-        return passage, True
+        return passage, True, chinese_chars
 
     def _truncate_at_sentence(self, passage: str, max_chars: int) -> str:
         """Truncate passage at the nearest sentence boundary before max_chars."""
-        # Find sentence endings (Chinese punctuation)
-        sentence_endings = ["。", "！", "？"]
+        # Position of the first Chinese character past the limit; any sentence
+        # ending before it keeps the passage within max_chars
+        overflow = next(islice(CJK_CHAR_PATTERN.finditer(passage), max_chars, None), None)
+        cutoff = overflow.start() if overflow else len(passage)
 
-        # Count Chinese characters and find truncation point
-        char_count = 0
-        last_sentence_end = 0
-
-        for i, char in enumerate(passage):
-            if "\u4e00" <= char <= "\u9fff":
-                char_count += 1
-            if char in sentence_endings:
-                if char_count <= max_chars:
-                    last_sentence_end = i + 1
-
-            if char_count > max_chars and last_sentence_end > 0:
-                break
+        # Find the last sentence ending (Chinese punctuation) before the cutoff
+        last_sentence_end = max(passage.rfind(p, 0, cutoff) for p in SENTENCE_ENDINGS) + 1
 
         if last_sentence_end > 0:
             return passage[:last_sentence_end]
@@ -129,13 +135,13 @@ class PassageGeneratorService:
     async def _fetch_hackernews_content(self) -> tuple[Optional[str], Optional[str]]:
         """Fetch page content from a random top HackerNews story.
 
-        Fetches the top 5 HN stories with URLs, shuffles them for variety,
-        and tries each one until a page fetch succeeds.
+        Fetches the top 5 HN stories with URLs and all of their pages
+        concurrently, then picks the first successful one in shuffled order.
 
         Returns:
             Tuple of (page_content, source_url) or (None, None) if all fail.
         """
-        from src.utils.web_scraper import fetch_hackernews_top_stories, fetch_page_text
+        from src.utils.web_scraper import fetch_hackernews_top_stories, fetch_pages
 
         stories = await fetch_hackernews_top_stories(count=5)
 
@@ -146,12 +152,11 @@ class PassageGeneratorService:
         # Shuffle for natural variety — different story each invocation
         random.shuffle(stories)
 
-        for story in stories:
+        pages = await fetch_pages([story.get("url", "") for story in stories])
+
+        for story, page_content in zip(stories, pages):
             title = story.get("title", "")
             url = story.get("url", "")
-            logger.info(f"Trying HN story: {title}")
-
-            page_content = await fetch_page_text(url)
 
             if page_content:
                 # Limit to first 2000 characters
@@ -161,7 +166,7 @@ class PassageGeneratorService:
                 logger.info(f"Selected HN story: {title} ({len(page_content)} chars)")
                 return page_content, url
 
-            logger.warning(f"Failed to fetch content from {url}, trying next story")
+            logger.warning(f"Failed to fetch content from {url} ({title}), trying next story")
 
         logger.warning("All HN story page fetches failed")
         return None, None
@@ -275,10 +280,8 @@ class PassageGeneratorService:
             passage, display_topic = await self._generate_free_topic_passage()
 
         # Validate and fix passage length
-        passage, is_valid = self._validate_and_fix_length(passage)
+        passage, is_valid, chinese_chars = self._validate_and_fix_length(passage)
 
-        # Count Chinese characters for logging
-        chinese_chars = len([c for c in passage if "\u4e00" <= c <= "\u9fff"])
         logger.info(
             f"Generated passage for topic '{display_topic}': {chinese_chars} Chinese chars "
             f"(total: {len(passage)} chars, mode: {settings.topic_selection_mode}, "
@@ -2,11 +2,22 @@
 
 import asyncio
 import logging
+from contextlib import aclosing
 from datetime import date
+from typing import AsyncIterator, Optional
+
+import httpx
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
 from src.core.config import settings
 from src.core.gowa import gowa_client
 from src.core.gowa.client import GowaClientError
+from src.services.mandarin_generator.idempotency import idempotency_store
 from src.services.mandarin_generator.service import (
     format_passage_message,
     passage_generator,
@@ -14,35 +25,201 @@ from src.services.mandarin_generator.service import (
 
 logger = logging.getLogger(__name__)
 
-# In-memory tracking for idempotency (prevents duplicate sends on retry)
-# Key: idempotency_key (e.g., "daily_passage_2026-01-09"), Value: set of sent recipients
-sent_recipients: dict[str, set[str]] = {}
+# Upper bound for runtime resizes of the send gate
+MAX_SEND_CONCURRENCY = 50
+
+
+class AdmissionController:
+    """
+    Resizable concurrency gate for outgoing sends.
+
+    Tracks the number of admitted sends explicitly under an asyncio.Condition
+    so the limit can be changed at runtime (e.g. backing off on GoWA 429s)
+    without touching asyncio.Semaphore internals. The limit can be moved
+    anywhere between 1 and the fixed ceiling, so worker pools sized to the
+    ceiling gain parallelism when it is raised.
+    """
+
+    def __init__(self, max_concurrent: int, ceiling: int = MAX_SEND_CONCURRENCY):
+        if not 1 <= max_concurrent <= ceiling:
+            raise ValueError(f"max_concurrent must be between 1 and {ceiling}")
+        self._ceiling = ceiling
+        self._max_concurrent = max_concurrent
+        self._active = 0
+        self._condition = asyncio.Condition(asyncio.Lock())
+
+    @property
+    def max_concurrent(self) -> int:
+        """Current concurrency limit."""
+        return self._max_concurrent
+
+    @property
+    def ceiling(self) -> int:
+        """Highest limit resize() accepts."""
+        return self._ceiling
+
+    @property
+    def active(self) -> int:
+        """Number of currently admitted sends."""
+        return self._active
+
+    async def acquire(self) -> None:
+        """Wait until a slot is free, then take it."""
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self._active < self._max_concurrent
+            )
+            self._active += 1
+
+    async def release(self) -> None:
+        """Free a slot and wake one waiter."""
+        async with self._condition:
+            self._active -= 1
+            self._condition.notify(1)
+
+    async def resize(self, max_concurrent: int) -> None:
+        """
+        Change the concurrency limit.
+
+        Growing the limit wakes all waiters so they can re-check the predicate;
+        shrinking takes effect as in-flight sends release their slots.
+        """
+        if not 1 <= max_concurrent <= self._ceiling:
+            raise ValueError(f"max_concurrent must be between 1 and {self._ceiling}")
+        async with self._condition:
+            grew = max_concurrent > self._max_concurrent
+            self._max_concurrent = max_concurrent
+            if grew:
+                self._condition.notify_all()
+        logger.info(f"Send concurrency limit resized to {max_concurrent}")
+
+    async def __aenter__(self) -> "AdmissionController":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.release()
+
+
+# Shared send gate; the scheduler or an endpoint can call send_controller.resize()
+send_controller = AdmissionController(
+    settings.max_concurrent_sends,
+    ceiling=max(MAX_SEND_CONCURRENCY, settings.max_concurrent_sends),
+)
+
+
+def _is_retryable_send_error(error: BaseException) -> bool:
+    """
+    Check if a failed send is transient and worth retrying.
+
+    5xx/429 responses and network errors are retried; other 4xx responses
+    (e.g. auth failures) and GoWA-level rejections are not.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        return status_code >= 500 or status_code == 429
+    return isinstance(error, httpx.TransportError)
 
 
-async def _send_to_recipient(
-    recipient: str,
+@retry(
+    stop=stop_after_attempt(4),
+    wait=wait_exponential_jitter(initial=0.5, exp_base=2, max=8, jitter=0.25),
+    retry=retry_if_exception(_is_retryable_send_error),
+    reraise=True,
+)
+async def _send_with_retry(recipient: str, message: str) -> None:
+    """
+    Send message to a recipient, backing off exponentially on transient errors.
+
+    Uses the single-attempt send so this is the only retry layer. Each
+    attempt takes its own send_controller slot, so backoff waits don't hold
+    a slot other recipients could use.
+    """
+    async with send_controller:
+        await gowa_client.send_message_once(phone=recipient, message=message)
+
+
+async def _send_worker(
+    queue: "asyncio.Queue[Optional[str]]",
     message: str,
-    semaphore: asyncio.Semaphore,
-) -> tuple[str, bool, str]:
+    results: "asyncio.Queue[tuple[str, bool, str]]",
+) -> None:
     """
-    Send message to a single recipient with concurrency control.
+    Drain recipients from the queue and send the message to each.
+
+    Runs until it receives the None sentinel. Each send attempt goes through
+    send_controller, so the number sending at once follows runtime resizes
+    in both directions (the pool is sized to the gate's ceiling).
 
     Args:
-        recipient: The recipient JID
+        queue: Queue of recipient JIDs, terminated by None sentinels
         message: The message to send
-        semaphore: Semaphore for concurrency limiting
-
-    Returns:
-        Tuple of (recipient, success, error_message)
+        results: Queue receiving (recipient, success, error_message) per send
     """
-    async with semaphore:
+    while True:
+        recipient = await queue.get()
         try:
-            await gowa_client.send_message(phone=recipient, message=message)
-            return (recipient, True, "")
-        except GowaClientError as e:
-            return (recipient, False, str(e))
-        except Exception as e:
-            return (recipient, False, f"Unexpected: {e}")
+            if recipient is None:
+                return
+
+            try:
+                await _send_with_retry(recipient, message)
+                results.put_nowait((recipient, True, ""))
+            except GowaClientError as e:
+                results.put_nowait((recipient, False, str(e)))
+            except httpx.HTTPStatusError as e:
+                results.put_nowait(
+                    (recipient, False, f"GoWA HTTP {e.response.status_code}: {e}")
+                )
+            except httpx.TransportError as e:
+                results.put_nowait((recipient, False, f"GoWA unreachable: {e!r}"))
+            except Exception as e:
+                results.put_nowait((recipient, False, f"Unexpected: {e}"))
+        finally:
+            queue.task_done()
+
+
+async def send_to_recipients(
+    recipients: list[str],
+    message: str,
+) -> AsyncIterator[tuple[str, bool, str]]:
+    """
+    Send a message to many recipients in parallel with concurrency control.
+
+    Results are yielded as each send completes, so failures surface
+    immediately instead of waiting for the slowest recipient. The generator
+    owns the send workers; iterate it under contextlib.aclosing so they are
+    stopped as soon as the caller stops consuming.
+
+    Args:
+        recipients: Recipient JIDs
+        message: The message to send
+
+    Yields:
+        Tuple of (recipient, success, error_message), in completion order
+    """
+    # Sized to the gate's ceiling, not its current limit, so raising the limit
+    # mid-run adds parallelism; workers beyond the limit wait on the gate
+    num_workers = min(send_controller.ceiling, len(recipients))
+    queue: asyncio.Queue[Optional[str]] = asyncio.Queue()
+    for recipient in recipients:
+        queue.put_nowait(recipient)
+    for _ in range(num_workers):
+        queue.put_nowait(None)
+
+    results: asyncio.Queue[tuple[str, bool, str]] = asyncio.Queue()
+    workers = [
+        asyncio.create_task(_send_worker(queue, message, results))
+        for _ in range(num_workers)
+    ]
+    try:
+        for _ in range(len(recipients)):
+            yield await results.get()
+    finally:
+        # Stop outstanding sends if the consumer bails out or is cancelled
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
 
 
 async def send_daily_passage(force: bool = False) -> None:
@@ -69,8 +246,8 @@ async def send_daily_passage(force: bool = False) -> None:
         pending_recipients = recipients
         already_sent: set[str] = set()
     else:
-        # Get already-sent recipients (for retry scenarios)
-        already_sent = sent_recipients.get(idempotency_key, set())
+        # Get already-sent recipients (for retry scenarios, survives restarts)
+        already_sent = await idempotency_store.already_sent(idempotency_key)
         pending_recipients = [r for r in recipients if r not in already_sent]
 
     if not pending_recipients:
@@ -90,33 +267,30 @@ async def send_daily_passage(force: bool = False) -> None:
         # Format the message with standard header
         message = format_passage_message(passage)
 
-        # Send to all pending recipients in parallel with concurrency limit
-        semaphore = asyncio.Semaphore(settings.max_concurrent_sends)
-        results = await asyncio.gather(
-            *[_send_to_recipient(r, message, semaphore) for r in pending_recipients],
-            return_exceptions=True,
-        )
-
-        # Process results and track successful sends
+        # Send to all pending recipients from a bounded pool of workers,
+        # tracking each result as soon as it completes
         success_count = len(already_sent)  # Start with already sent count
         failed_recipients = []
 
-        for result in results:
-            if isinstance(result, Exception):
-                logger.exception(f"Unexpected error in parallel send: {result}")
-                continue
-
-            recipient, success, error_msg = result
-            if success:
-                success_count += 1
-                # Track for idempotency
-                if idempotency_key not in sent_recipients:
-                    sent_recipients[idempotency_key] = set()
-                sent_recipients[idempotency_key].add(recipient)
-                logger.info(f"Daily passage sent to {recipient}")
-            else:
-                failed_recipients.append((recipient, error_msg))
-                logger.error(f"Failed to send to {recipient}: {error_msg}")
+        # aclosing stops the send workers as soon as this loop exits, including
+        # when it raises (e.g. a failed mark_sent)
+        try:
+            async with aclosing(
+                send_to_recipients(pending_recipients, message)
+            ) as results:
+                async for recipient, success, error_msg in results:
+                    if success:
+                        success_count += 1
+                        # Track for idempotency
+                        await idempotency_store.mark_sent(idempotency_key, recipient)
+                        logger.info(f"Daily passage sent to {recipient}")
+                    else:
+                        failed_recipients.append((recipient, error_msg))
+                        logger.error(f"Failed to send to {recipient}: {error_msg}")
+        finally:
+            # Persist buffered sends even if the run is cut short, so the
+            # next run doesn't send to those recipients again
+            await idempotency_store.flush()
 
         logger.info(
             f"Daily passage completed: {success_count}/{len(recipients)} recipients "
@@ -131,27 +305,3 @@ async def send_daily_passage(force: bool = False) -> None:
     except Exception as e:
         logger.exception(f"Failed to generate daily passage: {e}")
 
-
-def cleanup_sent_recipients(days_to_keep: int = 7) -> int:
-    """
-    Clean up old idempotency tracking entries.
-
-    Args:
-        days_to_keep: Number of days of history to keep
-
-    Returns:
-        Number of entries cleaned up
-    """
-    from datetime import timedelta
-
-    cutoff_date = date.today() - timedelta(days=days_to_keep)
-    cutoff_key = f"daily_passage_{cutoff_date.isoformat()}"
-
-    old_keys = [k for k in sent_recipients.keys() if k < cutoff_key]
-    for key in old_keys:
-        del sent_recipients[key]
-
-    if old_keys:
-        logger.debug(f"Cleaned up {len(old_keys)} old idempotency entries")
-
-    return len(old_keys)
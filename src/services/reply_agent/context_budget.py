@@ -0,0 +1,138 @@
+"""Token budget for Reply Agent conversations."""
+
+import functools
+import logging
+
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+# Context window sizes by model name prefix (vendor prefix stripped); first
+# match wins, so longer prefixes go before shorter ones
+MODEL_CONTEXT_WINDOWS = (
+    ("gemini-1.5-pro", 2_097_152),
+    ("gemini", 1_048_576),
+    ("gpt-4.1", 1_047_576),
+    ("gpt-5", 400_000),
+    ("gpt-4o", 128_000),
+    ("o3", 200_000),
+    ("o4", 200_000),
+)
+DEFAULT_CONTEXT_WINDOW = 128_000
+
+# Conversations are trimmed once they pass this share of the context window
+CONTEXT_BUDGET_RATIO = 0.8
+
+TRUNCATED_RESULTS = "<truncated earlier results>"
+
+# Rough characters-per-token ratio; close enough for a safety margin, and it
+# needs no tokenizer
+CHARS_PER_TOKEN = 4
+
+
+@functools.lru_cache(maxsize=None)
+def context_budget(model: str) -> int:
+    """
+    Get the token budget for a model's conversations.
+
+    Args:
+        model: Model name, with or without a vendor prefix (e.g. "openai/gpt-4o")
+
+    Returns:
+        CONTEXT_BUDGET_RATIO of the model's context window, in tokens
+    """
+    name = model.rsplit("/", 1)[-1].lower()
+    window = next(
+        (size for prefix, size in MODEL_CONTEXT_WINDOWS if name.startswith(prefix)),
+        DEFAULT_CONTEXT_WINDOW,
+    )
+    return int(window * CONTEXT_BUDGET_RATIO)
+
+
+def _message_chars(message: dict) -> int:
+    """Count the text characters of an OpenAI chat message (images are ignored)."""
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        chars = sum(len(part.get("text", "")) for part in content)
+    else:
+        chars = len(content)
+    for tool_call in message.get("tool_calls", []):
+        chars += len(tool_call["function"]["arguments"])
+    return chars
+
+
+def trim_tool_messages(messages: list[dict], model: str) -> int:
+    """
+    Keep an OpenAI-style conversation within the model's token budget.
+
+    Token counts are estimated from character length. Replaces the oldest
+    tool results with a placeholder, in place, until the conversation fits.
+
+    Args:
+        messages: Chat messages, modified in place
+        model: Model the conversation is sent to
+
+    Returns:
+        Number of tool results truncated
+    """
+    budget_chars = context_budget(model) * CHARS_PER_TOKEN
+    counts = [_message_chars(message) for message in messages]
+    total = sum(counts)
+    truncated = 0
+
+    for i, message in enumerate(messages):
+        if total <= budget_chars:
+            break
+        if message["role"] == "tool" and message["content"] != TRUNCATED_RESULTS:
+            messages[i] = {**message, "content": TRUNCATED_RESULTS}
+            total -= counts[i] - len(TRUNCATED_RESULTS)
+            truncated += 1
+
+    if truncated:
+        logger.info(f"Truncated {truncated} earlier tool result(s) to fit token budget")
+    return truncated
+
+
+def trim_function_responses(contents: list[types.Content], model: str) -> int:
+    """
+    Keep a Gemini conversation within the model's token budget.
+
+    Token counts are estimated from character length. Replaces the oldest
+    function responses with a placeholder, in place, until the conversation
+    fits.
+
+    Args:
+        contents: Conversation contents, modified in place
+        model: Model the conversation is sent to
+
+    Returns:
+        Number of function responses truncated
+    """
+
+    def part_chars(part: types.Part) -> int:
+        if part.text:
+            return len(part.text)
+        if part.function_response:
+            return len(str(part.function_response.response))
+        if part.function_call:
+            return len(str(part.function_call.args))
+        return 0
+
+    budget_chars = context_budget(model) * CHARS_PER_TOKEN
+    total = sum(part_chars(p) for c in contents for p in c.parts or [])
+    truncated = 0
+
+    for content in contents:
+        for part in content.parts or []:
+            if total <= budget_chars:
+                break
+            response = part.function_response
+            if response and response.response != {"results": TRUNCATED_RESULTS}:
+                before = part_chars(part)
+                response.response = {"results": TRUNCATED_RESULTS}
+                total -= before - part_chars(part)
+                truncated += 1
+
+    if truncated:
+        logger.info(f"Truncated {truncated} earlier function response(s) to fit token budget")
+    return truncated
@@ -1,12 +1,17 @@
-"""Pydantic models for Reply Agent service."""
+"""Data models for Reply Agent service."""
 
-from typing import Optional
+from typing import NamedTuple, Optional
 
 from pydantic import BaseModel, Field
 
 
-class SearchResult(BaseModel):
-    """Individual search result from web search tool."""
+class SearchResult(NamedTuple):
+    """
+    Individual search result from web search tool.
+
+    A tuple rather than a Pydantic model or dict: searches return many of
+    them per call, and tuples are the cheapest to build and hold.
+    """
 
     title: str
     link: str
@@ -27,11 +27,12 @@ async def process_query(request: QueryRequest) -> QueryResponse:
     - If recipient is provided, sends the response via WhatsApp
     - Returns the response and any sources used from web search
     """
-    # Decode base64 image if provided
+    # Decode base64 image once at the boundary; strict validation rejects
+    # malformed payloads here instead of deep in the provider call
     image_data = None
     if request.image_base64:
         try:
-            image_data = base64.b64decode(request.image_base64)
+            image_data = base64.b64decode(request.image_base64, validate=True)
             logger.info(f"Decoded image: {len(image_data)} bytes, type: {request.image_mime_type}")
         except Exception as e:
             logger.error(f"Failed to decode base64 image: {e}")
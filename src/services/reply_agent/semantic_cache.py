@@ -0,0 +1,106 @@
+"""Semantic response cache over prompt embeddings."""
+
+import logging
+from typing import Optional
+
+import numpy as np
+from openai import AsyncOpenAI
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Cache of responses keyed by prompt embedding similarity.
+
+    Reuses an earlier answer when a new prompt is a paraphrase of one already
+    answered (cosine similarity at or above the threshold). Embeddings are
+    normalized and kept in a preallocated matrix, so a lookup is a single
+    matrix-vector product; the least recently used slot is evicted when full.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        threshold: Optional[float] = None,
+    ):
+        self.max_entries = max_entries
+        self.threshold = (
+            threshold if threshold is not None else settings.semantic_cache_threshold
+        )
+        self._matrix: Optional[np.ndarray] = None  # Allocated on first add
+        self._responses: list[Optional[tuple[str, list[str]]]] = [None] * max_entries
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._count = 0
+        self._tick = 0
+
+    async def embed(self, client: AsyncOpenAI, text: str) -> np.ndarray:
+        """
+        Embed a prompt with the configured embedding model.
+
+        Args:
+            client: OpenAI-compatible client to request the embedding from
+            text: Prompt text
+
+        Returns:
+            Unit-length embedding vector
+        """
+        response = await client.embeddings.create(
+            model=settings.semantic_cache_embedding_model,
+            input=text,
+        )
+        vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def get(self, embedding: np.ndarray) -> Optional[tuple[str, list[str]]]:
+        """
+        Find the cached response for the most similar prompt.
+
+        Args:
+            embedding: Unit-length prompt embedding (see embed())
+
+        Returns:
+            Cached (response text, sources) tuple, or None below the threshold
+        """
+        if self._matrix is None or self._count == 0:
+            return None
+
+        similarities = self._matrix[: self._count] @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+
+        self._tick += 1
+        self._last_used[best] = self._tick
+        logger.debug(f"Semantic cache hit (similarity={similarities[best]:.3f})")
+        return self._responses[best]
+
+    def add(self, embedding: np.ndarray, response: tuple[str, list[str]]) -> None:
+        """
+        Store a response under its prompt embedding.
+
+        Args:
+            embedding: Unit-length prompt embedding (see embed())
+            response: (response text, sources) tuple to reuse on later hits
+        """
+        if self._matrix is None:
+            self._matrix = np.zeros(
+                (self.max_entries, embedding.shape[0]), dtype=np.float32
+            )
+
+        if self._count < self.max_entries:
+            slot = self._count
+            self._count += 1
+        else:
+            slot = int(np.argmin(self._last_used))
+
+        self._tick += 1
+        self._matrix[slot] = embedding
+        self._responses[slot] = response
+        self._last_used[slot] = self._tick
+
+
+# Singleton instance
+semantic_cache = SemanticCache()
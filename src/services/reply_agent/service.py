@@ -1,18 +1,45 @@
 """Reply Agent service with tool calling support."""
 
+import asyncio
 import base64
-import json
+import hashlib
 import logging
+import random
+import re
+import time
 from enum import Enum
-from typing import Literal, Optional
+from typing import AsyncIterator, Awaitable, Callable, Literal, Optional, TypeVar
 
 import dspy
+import numpy as np
+import orjson
+from cachetools import LRUCache, TTLCache
+from google import genai
+from google.genai import types
+from google.genai.errors import ClientError
+from openai import AsyncOpenAI
 
 from src.core.config import settings
+from src.core.http import get_http_client
+from src.llm.base import (
+    get_retry_after,
+    is_connection_error,
+    is_fallback_worthy_error,
+    is_rate_limit_error,
+)
+from src.llm.key_rotator import gemini_key_rotator
+from src.services.reply_agent.context_budget import (
+    trim_function_responses,
+    trim_tool_messages,
+)
+from src.services.reply_agent.models import SearchResult
+from src.services.reply_agent.semantic_cache import semantic_cache
 from src.services.reply_agent.tools import OPENAI_TOOLS, web_search_tool
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class ResponseState(Enum):
     """States for orchestrating LLM response handling."""
@@ -36,6 +63,12 @@ class IntermediaryClassifier(dspy.Signature):
     )
 
 
+# Classifier errors worth retrying on OpenRouter (rate limits and overload)
+CLASSIFIER_FALLBACK_PATTERN = re.compile(
+    r"429|quota|rate|exhausted|503|unavailable", re.IGNORECASE
+)
+
+
 def _get_gemini_lm() -> dspy.LM:
     """Get Gemini LM for DSPy."""
     return dspy.LM(
@@ -54,6 +87,100 @@ def _get_openrouter_lm() -> dspy.LM:
     )
 
 
+# Limits on search results fed back to the model as tool output
+MAX_SEARCH_RESULTS = 5
+SEARCH_TITLE_MAX_CHARS = 120
+SEARCH_SNIPPET_MAX_CHARS = 200
+
+# Images at least this large are hashed in a worker thread; hashlib releases
+# the GIL for big inputs, so the hash no longer stalls the event loop
+HASH_OFFLOAD_THRESHOLD_BYTES = 256 * 1024
+
+
+async def _sha256_digest(data: bytes) -> bytes:
+    """Get the sha256 digest of data, hashing large inputs off the event loop."""
+    if len(data) < HASH_OFFLOAD_THRESHOLD_BYTES:
+        return hashlib.sha256(data).digest()
+    return await asyncio.to_thread(lambda: hashlib.sha256(data).digest())
+
+
+# Base64 encodings of recent images by sha256 digest, shared by retries/fallbacks
+_image_b64_cache: LRUCache[bytes, str] = LRUCache(maxsize=64)
+
+
+async def _encode_image(image_data: bytes, digest: bytes) -> str:
+    """Base64-encode an image in a worker thread, reusing recent encodings.
+
+    Args:
+        image_data: Image bytes
+        digest: sha256 digest of image_data (see _sha256_digest)
+    """
+    encoded = _image_b64_cache.get(digest)
+    if encoded is None:
+        encoded = (await asyncio.to_thread(base64.b64encode, image_data)).decode()
+        _image_b64_cache[digest] = encoded
+    return encoded
+
+
+def _compact_search_results(results: list[SearchResult]) -> list[dict[str, str]]:
+    """Trim search results before feeding them back to the model.
+
+    Results are re-sent as context on every later turn, so capping their
+    count and field lengths keeps prefill tokens from compounding. Returns
+    dicts, the shape the tool-result JSON needs.
+    """
+    return [
+        {
+            "title": result.title[:SEARCH_TITLE_MAX_CHARS],
+            "link": result.link,
+            "snippet": result.snippet[:SEARCH_SNIPPET_MAX_CHARS],
+        }
+        for result in results[:MAX_SEARCH_RESULTS]
+    ]
+
+
+async def _run_web_searches(
+    queries: dict[str, str],
+    started: Optional[dict[str, asyncio.Task]] = None,
+) -> dict[str, list[dict[str, str]]]:
+    """
+    Run the web searches requested in one model turn.
+
+    Distinct queries run concurrently and identical queries run once, with
+    the result fanned back out to every tool call that asked for it.
+
+    Args:
+        queries: Search query by tool call id
+        started: Searches already running (see _stream_chat_turn), by call id
+
+    Returns:
+        Compacted search results by tool call id
+    """
+    searches: dict[str, Awaitable[list[SearchResult]]] = {}
+    for call_id, search_query in queries.items():
+        if started and call_id in started:
+            searches.setdefault(search_query, started[call_id])
+    for search_query in queries.values():
+        if search_query not in searches:
+            searches[search_query] = web_search_tool.search(search_query)
+
+    results = await asyncio.gather(*searches.values())
+    by_query = {
+        search_query: _compact_search_results(result)
+        for search_query, result in zip(searches, results)
+    }
+    return {call_id: by_query[q] for call_id, q in queries.items()}
+
+
+def _parse_search_query(arguments: str) -> Optional[str]:
+    """Return the web_search query once streamed arguments form complete JSON."""
+    try:
+        args = orjson.loads(arguments)
+    except orjson.JSONDecodeError:
+        return None
+    return args.get("query", "") if isinstance(args, dict) else None
+
+
 SYSTEM_INSTRUCTION = """You are Akasha, a helpful and friendly AI assistant available via WhatsApp.
 
 Your capabilities:
@@ -87,21 +214,150 @@ Guidelines:
 6. Be yourself—relaxed, fun, human. You're Akasha, their go-to chat buddy.
 7. When you need to search the web, call the web_search tool immediately without announcing it. Never say "let me search." Just search and respond with the answer directly."""
 
+# Shared system message for OpenAI-compatible requests; never mutated, so every
+# conversation starts from the same object instead of a fresh dict per query.
+# It must stay byte-identical across requests (no per-query data; that goes in
+# the user message) so provider-side prompt caching can reuse the prefix.
+SYSTEM_MESSAGE = {"role": "system", "content": REALISTIC_SYSTEM_INSTRUCTION}
+
+# Gemini tool and config objects are immutable; built once at import
+GEMINI_FUNCTION_TOOLS = [
+    types.Tool(
+        function_declarations=[
+            types.FunctionDeclaration(
+                name="web_search",
+                description="Search the web for current information. Use this when you need up-to-date information, recent news, or facts you're not certain about.",
+                parameters=types.Schema(
+                    type=types.Type.OBJECT,
+                    properties={
+                        "query": types.Schema(
+                            type=types.Type.STRING,
+                            description="The search query to look up",
+                        )
+                    },
+                    required=["query"],
+                ),
+            )
+        ]
+    )
+]
+GEMINI_CONFIG_WITH_TOOLS = types.GenerateContentConfig(
+    system_instruction=REALISTIC_SYSTEM_INSTRUCTION,
+    tools=GEMINI_FUNCTION_TOOLS,
+)
+GEMINI_CONFIG_FINAL = types.GenerateContentConfig(
+    system_instruction=REALISTIC_SYSTEM_INSTRUCTION,
+)
+
+
+def _merge_streamed_parts(parts: list[types.Part], new_parts: list[types.Part]) -> None:
+    """Append streamed Gemini parts, joining consecutive plain text fragments."""
+    for part in new_parts:
+        if (
+            part.text is not None
+            and parts
+            and parts[-1].text is not None
+            and not (part.thought or parts[-1].thought)
+            and not (part.thought_signature or parts[-1].thought_signature)
+        ):
+            parts[-1] = types.Part.from_text(text=parts[-1].text + part.text)
+        else:
+            parts.append(part)
+
+
+def _content_text(content: types.Content) -> str:
+    """Join the non-thought text parts of a Gemini model turn."""
+    return "".join(
+        part.text for part in content.parts if part.text and not part.thought
+    )
+
 
 class ReplyAgentService:
     """Service for handling AI-powered replies with tool calling."""
 
     TRIGGER_PHRASE = "hey akasha,"
+    TRIGGER_LEN = len(TRIGGER_PHRASE)
     MAX_TOOL_CALLS = 3
     MAX_ORCHESTRATION_ITERATIONS = 5  # Extra iterations for re-prompts
+    INFLIGHT_TTL_SECONDS = 120  # In-flight entries older than this are not joined
+    RATE_LIMIT_MAX_RETRIES = 3  # Backoff retries per API call on rate limits
+    MAX_RETRY_DELAY_SECONDS = 10.0  # Cap on a single backoff / Retry-After wait
+    BREAKER_FAILURE_THRESHOLD = 5  # Consecutive primary failures that open the breaker
+    BREAKER_COOLDOWN_SECONDS = 30.0  # How long the primary is skipped once open
+    RESPONSE_CACHE_SIZE = 512
+    RESPONSE_CACHE_TTL_SECONDS = 3600
+
+    def __init__(self) -> None:
+        # Clients are reused across queries so their HTTP connection pools
+        # (and keep-alive connections) survive; rebuilt only if the key changes
+        self._openai_client: Optional[AsyncOpenAI] = None
+        self._openai_client_key: Optional[str] = None
+        self._openrouter_client: Optional[AsyncOpenAI] = None
+        self._openrouter_client_key: Optional[str] = None
+
+        # Caps on concurrent LLM requests per provider (see _call_limited)
+        self._provider_semaphores = {
+            "openai": asyncio.Semaphore(settings.openai_max_concurrency),
+            "gemini": asyncio.Semaphore(settings.gemini_max_concurrency),
+            "openrouter": asyncio.Semaphore(settings.openrouter_max_concurrency),
+        }
+
+        # Circuit breaker on the primary provider; stays open until the
+        # monotonic deadline, and the failure count is only reset by a success
+        self._primary_failures = 0
+        self._primary_open_until = 0.0
+
+        # Single-flight map: query hash -> (shared result future, start time)
+        self._inflight: dict[str, tuple[asyncio.Future, float]] = {}
+
+        # Exact-match response cache: request hash -> (text, sources)
+        self._response_cache: TTLCache[str, tuple[str, list[str]]] = TTLCache(
+            maxsize=self.RESPONSE_CACHE_SIZE, ttl=self.RESPONSE_CACHE_TTL_SECONDS
+        )
+        self._response_cache_lock = asyncio.Lock()
+
+    @property
+    def openai_client(self) -> AsyncOpenAI:
+        """Cached OpenAI-compatible client for the primary OpenAI provider."""
+        if self._openai_client is None or self._openai_client_key != settings.openai_api_key:
+            self._openai_client = AsyncOpenAI(
+                base_url="https://openrouter.ai/api/v1",
+                api_key=settings.openai_api_key,
+                max_retries=0,
+                timeout=45.0,
+                http_client=get_http_client(),
+            )
+            self._openai_client_key = settings.openai_api_key
+        return self._openai_client
+
+    @property
+    def openrouter_client(self) -> AsyncOpenAI:
+        """Cached client for the OpenRouter fallback provider."""
+        if (
+            self._openrouter_client is None
+            or self._openrouter_client_key != settings.openrouter_api_key
+        ):
+            self._openrouter_client = AsyncOpenAI(
+                base_url="https://openrouter.ai/api/v1",
+                api_key=settings.openrouter_api_key,
+                max_retries=0,
+                timeout=45.0,
+                http_client=get_http_client(),
+            )
+            self._openrouter_client_key = settings.openrouter_api_key
+        return self._openrouter_client
 
     def should_trigger(self, message: str) -> bool:
         """Check if message should trigger the agent."""
-        return message.lower().startswith(self.TRIGGER_PHRASE)
+        # Lowercase only the prefix, not the whole (possibly long) message
+        return (
+            len(message) >= self.TRIGGER_LEN
+            and message[: self.TRIGGER_LEN].lower() == self.TRIGGER_PHRASE
+        )
 
     def extract_query(self, message: str) -> str:
         """Extract the user query after the trigger phrase."""
-        return message[len(self.TRIGGER_PHRASE) :].strip()
+        return message[self.TRIGGER_LEN :].strip()
 
     async def _is_intermediary_response(self, text: str) -> bool:
         """
@@ -114,7 +370,6 @@ class ReplyAgentService:
         Returns:
             True if intermediary, False if actual answer
         """
-        import asyncio
 
         async def classify_with_lm(lm: dspy.LM) -> str:
             """Run classification with given LM."""
@@ -133,14 +388,9 @@ class ReplyAgentService:
             classification = await classify_with_lm(gemini_lm)
 
         except Exception as e:
-            error_str = str(e).lower()
+            error_message = str(e)
             is_fallback_worthy = (
-                "429" in str(e)
-                or "quota" in error_str
-                or "rate" in error_str
-                or "exhausted" in error_str
-                or "503" in str(e)
-                or "unavailable" in error_str
+                CLASSIFIER_FALLBACK_PATTERN.search(error_message) is not None
             )
 
             if (
@@ -163,7 +413,7 @@ class ReplyAgentService:
                     return False
             else:
                 logger.warning(
-                    f"Intermediary classification failed: {e}, "
+                    f"Intermediary classification failed: {error_message[:200]}, "
                     "defaulting to final_answer"
                 )
                 return False
@@ -211,7 +461,9 @@ class ReplyAgentService:
         Process a user query using the LLM with tool calling.
 
         Supports automatic fallback to alternate provider if primary is exhausted.
-        Supports multimodal queries with images.
+        Supports multimodal queries with images. Identical queries arriving
+        while one is already in flight share its result instead of running
+        a second LLM + web search pipeline.
 
         Args:
             query: User's question/request
@@ -222,6 +474,66 @@ class ReplyAgentService:
         Returns:
             Tuple of (response text, list of source URLs used)
         """
+        # Hashed once here; the caches below all key the image by this digest
+        image_digest = await _sha256_digest(image_data) if image_data else None
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(query.encode())
+        digest.update(b"\0" + (quoted_context or "").encode())
+        if image_digest:
+            digest.update(b"\0" + image_digest)
+        key = digest.hexdigest()
+
+        while True:
+            inflight = self._inflight.get(key)
+            if not inflight or (
+                time.monotonic() - inflight[1] >= self.INFLIGHT_TTL_SECONDS
+            ):
+                break
+            logger.info("Identical query already in flight, awaiting its result")
+            try:
+                return await asyncio.shield(inflight[0])
+            except asyncio.CancelledError:
+                if not inflight[0].cancelled():
+                    raise  # This request was cancelled, not the shared one
+                # The request running the pipeline was cancelled; run it again
+                # here (or join whichever waiter restarted it first)
+                logger.info("In-flight identical query was cancelled, retrying")
+
+        future: asyncio.Future[tuple[str, list[str]]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._inflight[key] = (future, time.monotonic())
+        try:
+            result = await self._process_query(
+                query, quoted_context, image_data, image_mime_type, image_digest
+            )
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so asyncio doesn't warn when nobody else awaited it
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key, (None,))[0] is future:
+                del self._inflight[key]
+
+    async def _process_query(
+        self,
+        query: str,
+        quoted_context: Optional[str] = None,
+        image_data: Optional[bytes] = None,
+        image_mime_type: Optional[str] = None,
+        image_digest: Optional[bytes] = None,
+    ) -> tuple[str, list[str]]:
+        """Run the provider pipeline for a query, with fallback (see process_query).
+
+        image_digest is the sha256 digest of image_data, computed by the caller.
+        """
         # Build prompt with context if replying to a message
         if quoted_context:
             if "\n" in quoted_context and "]:" in quoted_context:
@@ -239,40 +551,118 @@ User's question/comment: {query}"""
 
         primary_provider = settings.llm_provider.lower()
 
+        # Exact-match cache, keyed on everything that shapes the answer
+        image_hash = image_digest.hex() if image_digest else None
+        cache_key = hashlib.sha256(
+            orjson.dumps(
+                {
+                    "provider": primary_provider,
+                    "system": REALISTIC_SYSTEM_INSTRUCTION,
+                    "prompt": full_prompt,
+                    "img": image_hash,
+                },
+                option=orjson.OPT_SORT_KEYS,
+            )
+        ).hexdigest()
+        async with self._response_cache_lock:
+            cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Returning cached response for identical prompt")
+            return cached[0], list(cached[1])
+
+        # Semantic cache catches paraphrases of text-only prompts
+        embedding = None
+        if settings.semantic_cache_enabled and not image_data:
+            embedding = await self._embed_prompt(full_prompt)
+            if embedding is not None:
+                cached = semantic_cache.get(embedding)
+                if cached is not None:
+                    logger.info("Returning cached response for similar prompt")
+                    return cached[0], list(cached[1])
+
+        result = await self._call_with_fallback(
+            primary_provider, full_prompt, image_data, image_mime_type, image_digest
+        )
+
+        # Answers built from web search results are time-sensitive; don't reuse them
+        if not result[1]:
+            async with self._response_cache_lock:
+                self._response_cache[cache_key] = result
+            if embedding is not None:
+                semantic_cache.add(embedding, result)
+        return result
+
+    async def _embed_prompt(self, prompt: str) -> Optional[np.ndarray]:
+        """Embed a prompt for the semantic cache; None if unavailable or failed."""
+        if settings.openai_api_key:
+            client = self.openai_client
+        elif settings.openrouter_api_key:
+            client = self.openrouter_client
+        else:
+            return None
+        try:
+            return await semantic_cache.embed(client, prompt)
+        except Exception as e:
+            logger.warning(f"Prompt embedding failed, skipping semantic cache: {e}")
+            return None
+
+    async def _call_with_fallback(
+        self,
+        primary_provider: str,
+        full_prompt: str,
+        image_data: Optional[bytes] = None,
+        image_mime_type: Optional[str] = None,
+        image_digest: Optional[bytes] = None,
+    ) -> tuple[str, list[str]]:
+        """Call the primary provider, falling back to OpenRouter on provider errors.
+
+        After BREAKER_FAILURE_THRESHOLD consecutive provider, timeout or
+        connection failures the primary is skipped for BREAKER_COOLDOWN_SECONDS;
+        the first failure after the cooldown reopens the breaker straight away.
+        """
+        # Fallback is always OpenRouter (text-only, no vision)
+        can_fall_back = settings.llm_fallback_enabled and self._can_use_provider(
+            "openrouter"
+        )
+        if can_fall_back and time.monotonic() < self._primary_open_until:
+            logger.info(
+                f"Circuit breaker open for '{primary_provider}', using 'openrouter'"
+            )
+            if image_data:
+                logger.info(
+                    "Stripping image data for OpenRouter fallback "
+                    "(model does not support vision)"
+                )
+            return await self._call_provider("openrouter", full_prompt, None, None)
+
+        # Encode the image once per query; OpenAI takes it as a base64 data URL
+        image_b64 = None
+        if image_data and image_digest and primary_provider == "openai":
+            image_b64 = await _encode_image(image_data, image_digest)
+
         # Try primary provider first
         try:
-            return await self._call_provider(
-                primary_provider, full_prompt, image_data, image_mime_type
+            result = await self._call_provider(
+                primary_provider, full_prompt, image_data, image_mime_type, image_b64
             )
+            self._primary_failures = 0
+            return result
         except Exception as e:
-            error_str = str(e).lower()
-
-            # Check if this is an error that warrants trying the fallback provider
-            is_fallback_worthy_error = (
-                # Rate limit / quota errors
-                "429" in str(e)
-                or "quota" in error_str
-                or "rate" in error_str
-                or "exhausted" in error_str
-                or "all api keys" in error_str
-                # Invalid/expired API key errors
-                or "api_key_invalid" in error_str
-                or "api key expired" in error_str
-                or "invalid_argument" in error_str
-                or "invalid api key" in error_str
-                # SERVER OVERLOAD / UNAVAILABLE ERRORS
-                or "503" in str(e)
-                or "500" in error_str
-                or "unavailable" in error_str
-                or "overload" in error_str
-                or "overloaded" in error_str
-                or "internal error" in error_str
-                or "temporarily unavailable" in error_str
-            )
+            # Timeouts count too: with SDK retries off they surface at once, and
+            # an unresponsive primary is exactly what the breaker is for
+            if is_fallback_worthy_error(e) or is_connection_error(e):
+                self._primary_failures += 1
+                if self._primary_failures >= self.BREAKER_FAILURE_THRESHOLD:
+                    self._primary_open_until = (
+                        time.monotonic() + self.BREAKER_COOLDOWN_SECONDS
+                    )
+                    logger.warning(
+                        f"Primary provider '{primary_provider}' failed "
+                        f"{self._primary_failures} times in a row, skipping it for "
+                        f"{self.BREAKER_COOLDOWN_SECONDS:.0f}s"
+                    )
 
-            # Fallback is always OpenRouter (text-only, no vision)
-            if settings.llm_fallback_enabled and is_fallback_worthy_error:
-                if self._can_use_provider("openrouter"):
+                if can_fall_back:
                     if image_data:
                         logger.info(
                             "Stripping image data for OpenRouter fallback "
@@ -289,6 +679,69 @@ User's question/comment: {query}"""
             # Re-raise if fallback not possible
             raise
 
+    async def _call_with_backoff(
+        self, provider: str, call: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Make a single API call, retrying rate limits with exponential backoff.
+
+        Transient 429s often clear within a second or two, so retrying the
+        one call that hit them avoids both a provider switch and re-running
+        the turns already completed.
+
+        Args:
+            provider: Provider name; its concurrency cap is held per attempt,
+                never across backoff sleeps
+            call: Zero-argument coroutine function making the API call
+
+        Returns:
+            The call's result
+        """
+        try:
+            return await self._call_limited(provider, call)
+        except Exception as e:
+            if not is_rate_limit_error(e):
+                raise
+            return await self._retry_after_rate_limit(provider, call, e)
+
+    async def _retry_after_rate_limit(
+        self, provider: str, call: Callable[[], Awaitable[T]], error: Exception
+    ) -> T:
+        """
+        Retry a rate-limited API call up to RATE_LIMIT_MAX_RETRIES times.
+
+        Waits 2**attempt seconds plus jitter, or the error's Retry-After if it
+        exposes one. Non-rate-limit errors, and the last rate limit error once
+        retries run out, are raised for the fallback logic in
+        _call_with_fallback.
+
+        Args:
+            provider: Provider name; its concurrency cap is held per attempt,
+                never across backoff sleeps
+            call: Zero-argument coroutine function making the API call
+            error: Rate limit error raised by the previous attempt
+
+        Returns:
+            The call's result
+        """
+        for attempt in range(self.RATE_LIMIT_MAX_RETRIES):
+            delay = get_retry_after(error)
+            if delay is None:
+                delay = 2**attempt + random.uniform(0, 0.5)
+            delay = min(delay, self.MAX_RETRY_DELAY_SECONDS)
+            logger.warning(
+                f"Provider '{provider}' rate limited ({type(error).__name__}), "
+                f"retry {attempt + 1}/{self.RATE_LIMIT_MAX_RETRIES} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+            try:
+                return await self._call_limited(provider, call)
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                error = e
+        raise error
+
     def _can_use_provider(self, provider: str) -> bool:
         """Check if a provider has valid API keys configured."""
         if provider == "openai":
@@ -305,41 +758,152 @@ User's question/comment: {query}"""
         prompt: str,
         image_data: Optional[bytes] = None,
         image_mime_type: Optional[str] = None,
+        image_b64: Optional[str] = None,
     ) -> tuple[str, list[str]]:
-        """Call the specified LLM provider."""
+        """Call the specified LLM provider.
+
+        OpenAI consumes the pre-encoded image_b64; Gemini takes raw image_data.
+        """
         if provider == "openai":
-            return await self._process_with_openai(prompt, image_data, image_mime_type)
+            return await self._process_with_openai(prompt, image_b64, image_mime_type)
         elif provider == "gemini":
             return await self._process_with_gemini(prompt, image_data, image_mime_type)
         elif provider == "openrouter":
             return await self._process_with_openrouter(prompt)
-        else:
-            raise ValueError(f"Unsupported LLM provider: {provider}")
+        raise ValueError(f"Unsupported LLM provider: {provider}")
+
+    async def _call_limited(self, provider: str, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Make a single API call while holding one of the provider's slots.
+
+        Only the LLM request itself is counted, so searches, classification
+        and backoff sleeps between calls don't tie up provider slots.
+
+        Args:
+            provider: Provider whose concurrency cap applies
+            call: Zero-argument coroutine function making the API call
+
+        Returns:
+            The call's result
+        """
+        # Cap in-flight calls per provider so bursts don't trigger upstream 429s
+        async with self._provider_semaphores[provider]:
+            return await call()
+
+    async def _stream_completion(
+        self,
+        client: AsyncOpenAI,
+        model: str,
+        messages: list[dict],
+    ) -> str:
+        """Stream a tool-free chat completion and return the assembled text.
+
+        Only used for the terminal call, where no tool_calls need inspecting,
+        so text is consumed as soon as the first tokens arrive.
+        """
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            stream=True,
+            timeout=45.0,
+        )
+
+        chunks: list[str] = []
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                chunks.append(chunk.choices[0].delta.content)
+        return "".join(chunks)
+
+    async def _stream_chat_turn(
+        self,
+        client: AsyncOpenAI,
+        model: str,
+        messages: list[dict],
+        use_tools: bool,
+    ) -> tuple[dict, dict[str, asyncio.Task]]:
+        """Stream one OpenAI-compatible chat turn.
+
+        Tool-call argument deltas are accumulated per call; as soon as a
+        web_search call's arguments form complete JSON, the search starts in
+        the background so it overlaps with the rest of the decode.
+
+        Returns:
+            Tuple of (assistant message dict, pending searches by tool call id)
+        """
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            tools=OPENAI_TOOLS if use_tools else None,
+            tool_choice="auto" if use_tools else None,
+            stream=True,
+            timeout=45.0,
+        )
+
+        content_parts: list[str] = []
+        calls: dict[int, dict] = {}
+        searches: dict[int, asyncio.Task] = {}
+        by_query: dict[str, asyncio.Task] = {}  # Identical queries share one search
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    content_parts.append(delta.content)
+
+                for tc in delta.tool_calls or []:
+                    call = calls.setdefault(
+                        tc.index,
+                        {"id": "", "type": "function", "function": {"name": "", "arguments": ""}},
+                    )
+                    if tc.id:
+                        call["id"] = tc.id
+                    if tc.function:
+                        call["function"]["name"] += tc.function.name or ""
+                        call["function"]["arguments"] += tc.function.arguments or ""
+
+                    if tc.index not in searches and call["function"]["name"] == "web_search":
+                        search_query = _parse_search_query(call["function"]["arguments"])
+                        if search_query is not None:
+                            if search_query not in by_query:
+                                by_query[search_query] = asyncio.create_task(
+                                    web_search_tool.search(search_query)
+                                )
+                            searches[tc.index] = by_query[search_query]
+        except BaseException:
+            for task in searches.values():
+                task.cancel()
+            raise
+
+        tool_calls = [calls[i] for i in sorted(calls)]
+        assistant_message: dict = {
+            "role": "assistant",
+            "content": "".join(content_parts) or None,
+        }
+        if tool_calls:
+            assistant_message["tool_calls"] = tool_calls
+        return assistant_message, {calls[i]["id"]: task for i, task in searches.items()}
 
     async def _process_with_openai(
         self,
         query: str,
-        image_data: Optional[bytes] = None,
+        image_b64: Optional[str] = None,
         image_mime_type: Optional[str] = None,
     ) -> tuple[str, list[str]]:
         """Process query using OpenAI with orchestrated tool calling.
 
         Uses a state machine to ensure we only return final answers,
         not intermediary feedback like "Let me search for that".
+        The optional image is passed already base64-encoded.
         """
-        from openai import AsyncOpenAI
-
-        client = AsyncOpenAI(
-            base_url="https://openrouter.ai/api/v1", api_key=settings.openai_api_key
-        )
+        client = self.openai_client
 
         # Build user content - either simple text or multimodal with image
-        if image_data and image_mime_type:
-            b64_image = base64.b64encode(image_data).decode()
+        if image_b64 and image_mime_type:
             user_content: list[dict] | str = [
                 {
                     "type": "image_url",
-                    "image_url": {"url": f"data:{image_mime_type};base64,{b64_image}"},
+                    "image_url": {"url": f"data:{image_mime_type};base64,{image_b64}"},
                 },
                 {"type": "text", "text": query},
             ]
@@ -350,7 +914,7 @@ User's question/comment: {query}"""
             user_content = query
 
         messages: list[dict] = [
-            {"role": "system", "content": REALISTIC_SYSTEM_INSTRUCTION},
+            SYSTEM_MESSAGE,
             {"role": "user", "content": user_content},
         ]
         sources_used: list[str] = []
@@ -361,17 +925,15 @@ User's question/comment: {query}"""
             # Disable tools after MAX_TOOL_CALLS to force text response
             use_tools = tool_calls_made < self.MAX_TOOL_CALLS
 
-            response = await client.chat.completions.create(
-                model=settings.openai_model,
-                messages=messages,
-                tools=OPENAI_TOOLS if use_tools else None,
-                tool_choice="auto" if use_tools else None,
-                timeout=45.0,
+            assistant_message, pending_searches = await self._call_with_backoff(
+                "openai",
+                lambda: self._stream_chat_turn(
+                    client, settings.openai_model, messages, use_tools
+                ),
             )
-
-            assistant_message = response.choices[0].message
-            has_tool_calls = bool(assistant_message.tool_calls)
-            response_text = assistant_message.content or ""
+            tool_calls = assistant_message.get("tool_calls", [])
+            has_tool_calls = bool(tool_calls)
+            response_text = assistant_message["content"] or ""
 
             # Classify the response using state machine
             state = await self._classify_response(response_text, has_tool_calls)
@@ -385,24 +947,29 @@ User's question/comment: {query}"""
                 messages.append(assistant_message)
                 tool_calls_made += 1
 
-                for tool_call in assistant_message.tool_calls:
-                    if tool_call.function.name == "web_search":
-                        args = json.loads(tool_call.function.arguments)
-                        search_query = args.get("query", "")
-
-                        logger.info(f"OpenAI tool call: web_search('{search_query}')")
-                        search_results = await web_search_tool.search(search_query)
-
+                queries: dict[str, str] = {}
+                for tool_call in tool_calls:
+                    if tool_call["function"]["name"] == "web_search":
+                        args = orjson.loads(tool_call["function"]["arguments"])
+                        queries[tool_call["id"]] = args.get("query", "")
+                for search_query in queries.values():
+                    logger.info(f"OpenAI tool call: web_search('{search_query}')")
+                results_by_call = await _run_web_searches(queries, pending_searches)
+
+                for tool_call in tool_calls:
+                    if tool_call["id"] in results_by_call:
+                        search_results = results_by_call[tool_call["id"]]
                         for result in search_results:
                             sources_used.append(result["link"])
 
                         messages.append(
                             {
                                 "role": "tool",
-                                "tool_call_id": tool_call.id,
-                                "content": json.dumps(search_results),
+                                "tool_call_id": tool_call["id"],
+                                "content": orjson.dumps(search_results).decode(),
                             }
                         )
+                trim_tool_messages(messages, settings.openai_model)
                 # Continue loop to get response with search results
 
             elif state == ResponseState.INTERMEDIARY:
@@ -426,12 +993,14 @@ User's question/comment: {query}"""
 
         # Fallback: max iterations reached, force final response without tools
         logger.warning("OpenAI max orchestration iterations reached, forcing response")
-        response = await client.chat.completions.create(
-            model=settings.openai_model,
-            messages=messages,
-            timeout=45.0,
+        # Only summarizes already-collected context, so a lighter model will do
+        response_text = await self._call_with_backoff(
+            "openai",
+            lambda: self._stream_completion(
+                client, settings.openai_final_model or settings.openai_model, messages
+            ),
         )
-        return response.choices[0].message.content or "", sources_used
+        return response_text, sources_used
 
     async def _process_with_gemini(
         self,
@@ -440,35 +1009,8 @@ User's question/comment: {query}"""
         image_mime_type: Optional[str] = None,
     ) -> tuple[str, list[str]]:
         """Process query using Gemini with tool calling, key rotation, and optional image."""
-        from google.genai import types
-        from google.genai.errors import ClientError
-
-        from src.llm.key_rotator import gemini_key_rotator
-
         sources_used: list[str] = []
 
-        # Define tools for Gemini
-        tools = [
-            types.Tool(
-                function_declarations=[
-                    types.FunctionDeclaration(
-                        name="web_search",
-                        description="Search the web for current information. Use this when you need up-to-date information, recent news, or facts you're not certain about.",
-                        parameters=types.Schema(
-                            type=types.Type.OBJECT,
-                            properties={
-                                "query": types.Schema(
-                                    type=types.Type.STRING,
-                                    description="The search query to look up",
-                                )
-                            },
-                            required=["query"],
-                        ),
-                    )
-                ]
-            )
-        ]
-
         # Build content parts - text only or multimodal with image
         parts: list[types.Part] = []
         if image_data and image_mime_type:
@@ -482,43 +1024,132 @@ User's question/comment: {query}"""
 
         contents: list[types.Content] = [types.Content(role="user", parts=parts)]
 
-        async def call_with_rotation(config: types.GenerateContentConfig):
-            """Make Gemini API call with automatic key rotation on errors."""
-            num_keys = len(gemini_key_rotator._keys)
+        async def open_stream(
+            client: genai.Client, config: types.GenerateContentConfig, model: str
+        ) -> tuple[Optional[types.GenerateContentResponse], AsyncIterator]:
+            """Start a Gemini stream and wait for its first chunk."""
+            stream = await client.aio.models.generate_content_stream(
+                model=model,
+                contents=contents,
+                config=config,
+            )
+            chunks = aiter(stream)
+            return await anext(chunks, None), chunks
+
+        async def read_stream(
+            first: Optional[types.GenerateContentResponse], chunks: AsyncIterator
+        ) -> types.Content:
+            """Assemble the model turn from a stream's first and remaining chunks."""
+            parts: list[types.Part] = []
+
+            def merge(chunk: types.GenerateContentResponse) -> None:
+                if chunk.candidates and chunk.candidates[0].content:
+                    _merge_streamed_parts(parts, chunk.candidates[0].content.parts or [])
+
+            if first is not None:
+                merge(first)
+                async for chunk in chunks:
+                    merge(chunk)
+            return types.Content(role="model", parts=parts)
+
+        async def stream_turn(
+            client: genai.Client, config: types.GenerateContentConfig, model: str
+        ) -> types.Content:
+            """Stream one Gemini call and assemble the model turn from its chunks."""
+            return await read_stream(*await open_stream(client, config, model))
+
+        async def close_stream(chunks: AsyncIterator) -> None:
+            """Close an opened stream that won't be read, releasing its connection."""
+            aclose = getattr(chunks, "aclose", None)
+            if aclose is not None:
+                try:
+                    await aclose()
+                except Exception as e:
+                    logger.debug(f"Failed to close unused Gemini stream: {e}")
+
+        async def hedged_turn(
+            config: types.GenerateContentConfig, model: str
+        ) -> types.Content:
+            """Stream a Gemini call, racing a second key if the first is slow to start.
+
+            If the current key hasn't sent its first chunk within the hedge
+            delay, the same request is sent on the next key (without rotating)
+            and whichever stream starts first is read to the end; the other is
+            cancelled, or closed if it had opened too. A slow but started
+            stream is never duplicated. Raises the first key's error if both
+            fail.
+            """
+            tasks = [
+                asyncio.create_task(
+                    open_stream(gemini_key_rotator.get_client(), config, model)
+                )
+            ]
+            winner: Optional[asyncio.Task] = None
+            try:
+                done, _ = await asyncio.wait(
+                    tasks, timeout=settings.llm_hedge_delay_seconds
+                )
+                if not done and gemini_key_rotator.num_keys > 1:
+                    logger.info(
+                        "Gemini call sent no chunk within "
+                        f"{settings.llm_hedge_delay_seconds}s, hedging on next API key"
+                    )
+                    tasks.append(
+                        asyncio.create_task(
+                            open_stream(
+                                gemini_key_rotator.peek_next_client(), config, model
+                            )
+                        )
+                    )
+                    pending = set(tasks)
+                    while pending and winner is None:
+                        done, pending = await asyncio.wait(
+                            pending, return_when=asyncio.FIRST_COMPLETED
+                        )
+                        winner = next(
+                            (t for t in tasks if t in done and t.exception() is None),
+                            None,
+                        )
+                # Both failed (or no hedge was sent): the first key's outcome
+                winner = winner or tasks[0]
+                opened = await winner
+            finally:
+                # Cancel the loser, or close its stream if it opened as well
+                # (e.g. both finished in the same wait)
+                for task in tasks:
+                    if task is winner:
+                        continue
+                    if not task.done():
+                        task.cancel()
+                    elif not task.cancelled() and task.exception() is None:
+                        await close_stream(task.result()[1])
+            return await read_stream(*opened)
+
+        async def call_with_rotation(
+            config: types.GenerateContentConfig,
+            model: str = settings.gemini_model,
+        ) -> types.Content:
+            """Make a streamed Gemini API call with automatic key rotation on errors.
+
+            Each key is tried once; if every key is rate limited, the call is
+            retried on the current key with exponential backoff.
+
+            Returns the model turn assembled from the streamed chunks.
+            """
+            num_keys = gemini_key_rotator.num_keys
             last_error = None
 
+            async def turn() -> types.Content:
+                if settings.llm_hedge_enabled:
+                    return await hedged_turn(config, model)
+                return await stream_turn(gemini_key_rotator.get_client(), config, model)
+
             for attempt in range(num_keys):
-                client = gemini_key_rotator.get_client()
                 try:
-                    return await client.aio.models.generate_content(
-                        model=settings.gemini_model,
-                        contents=contents,
-                        config=config,
-                    )
+                    return await self._call_limited("gemini", turn)
                 except ClientError as e:
-                    error_str = str(e).lower()
                     # Check if error warrants trying next key
-                    is_rotatable_error = (
-                        # Rate limit / quota errors
-                        "429" in str(e)
-                        or "quota" in error_str
-                        or "rate" in error_str
-                        or "exhausted" in error_str
-                        or "all api keys" in error_str
-                        # Invalid/expired API key errors
-                        or "api_key_invalid" in error_str
-                        or "api key expired" in error_str
-                        or "invalid_argument" in error_str
-                        or "invalid api key" in error_str
-                        # SERVER OVERLOAD / UNAVAILABLE ERRORS
-                        or "503" in str(e)
-                        or "500" in error_str
-                        or "unavailable" in error_str
-                        or "overload" in error_str
-                        or "overloaded" in error_str
-                        or "internal error" in error_str
-                        or "temporarily unavailable" in error_str
-                    )
+                    is_rotatable_error = is_fallback_worthy_error(e)
 
                     if is_rotatable_error:
                         last_error = e
@@ -529,6 +1160,8 @@ User's question/comment: {query}"""
                     else:
                         raise
 
+            if last_error is not None and is_rate_limit_error(last_error):
+                return await self._retry_after_rate_limit("gemini", turn, last_error)
             raise last_error or ClientError("All API keys exhausted")
 
         tool_calls_made = 0
@@ -538,23 +1171,17 @@ User's question/comment: {query}"""
             # Disable tools after MAX_TOOL_CALLS to force text response
             use_tools = tool_calls_made < self.MAX_TOOL_CALLS
 
-            response = await call_with_rotation(
-                types.GenerateContentConfig(
-                    system_instruction=REALISTIC_SYSTEM_INSTRUCTION,
-                    tools=tools if use_tools else None,
-                )
+            model_content = await call_with_rotation(
+                GEMINI_CONFIG_WITH_TOOLS if use_tools else GEMINI_CONFIG_FINAL
             )
 
-            candidate = response.candidates[0]
-
             # Check for function calls in response parts
-            function_calls = []
-            for part in candidate.content.parts:
-                if hasattr(part, "function_call") and part.function_call:
-                    function_calls.append(part.function_call)
+            function_calls = [
+                part.function_call for part in model_content.parts if part.function_call
+            ]
 
             has_tool_calls = bool(function_calls)
-            response_text = response.text or ""
+            response_text = _content_text(model_content)
 
             # Classify the response using state machine
             state = await self._classify_response(response_text, has_tool_calls)
@@ -565,17 +1192,23 @@ User's question/comment: {query}"""
 
             if state == ResponseState.NEEDS_TOOL_CALL:
                 # Execute tool calls
-                contents.append(candidate.content)
+                contents.append(model_content)
                 tool_calls_made += 1
 
-                function_responses = []
-                for fc in function_calls:
-                    if fc.name == "web_search":
-                        search_query = fc.args.get("query", "")
-
-                        logger.info(f"Gemini tool call: web_search('{search_query}')")
-                        search_results = await web_search_tool.search(search_query)
+                # Gemini function calls carry no ids; key them by position
+                queries: dict[str, str] = {
+                    str(i): fc.args.get("query", "")
+                    for i, fc in enumerate(function_calls)
+                    if fc.name == "web_search"
+                }
+                for search_query in queries.values():
+                    logger.info(f"Gemini tool call: web_search('{search_query}')")
+                results_by_call = await _run_web_searches(queries)
 
+                function_responses = []
+                for i, fc in enumerate(function_calls):
+                    if str(i) in results_by_call:
+                        search_results = results_by_call[str(i)]
                         for result in search_results:
                             sources_used.append(result["link"])
 
@@ -589,12 +1222,13 @@ User's question/comment: {query}"""
                         )
 
                 contents.append(types.Content(role="user", parts=function_responses))
+                trim_function_responses(contents, settings.gemini_model)
                 # Continue loop to get response with search results
 
             elif state == ResponseState.INTERMEDIARY:
                 # Don't return intermediary feedback - prompt for actual answer
                 logger.debug(f"Detected intermediary response: {response_text[:80]}...")
-                contents.append(candidate.content)
+                contents.append(model_content)
                 contents.append(
                     types.Content(
                         role="user",
@@ -616,12 +1250,12 @@ User's question/comment: {query}"""
 
         # Fallback: max iterations reached, force final response without tools
         logger.warning("Gemini max orchestration iterations reached, forcing response")
-        response = await call_with_rotation(
-            types.GenerateContentConfig(
-                system_instruction=REALISTIC_SYSTEM_INSTRUCTION,
-            )
+        # Only summarizes already-collected context, so a lighter model will do
+        final_model = settings.gemini_final_model or settings.gemini_model
+        response_text = _content_text(
+            await call_with_rotation(GEMINI_CONFIG_FINAL, final_model)
         )
-        return response.text or "", sources_used
+        return response_text, sources_used
 
     async def _process_with_openrouter(
         self,
@@ -632,15 +1266,10 @@ User's question/comment: {query}"""
         Uses the same OpenAI-compatible API format but with dedicated
         OpenRouter credentials. No vision/image support.
         """
-        from openai import AsyncOpenAI
-
-        client = AsyncOpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=settings.openrouter_api_key,
-        )
+        client = self.openrouter_client
 
         messages: list[dict] = [
-            {"role": "system", "content": REALISTIC_SYSTEM_INSTRUCTION},
+            SYSTEM_MESSAGE,
             {"role": "user", "content": query},
         ]
         sources_used: list[str] = []
@@ -649,17 +1278,15 @@ User's question/comment: {query}"""
         for iteration in range(self.MAX_ORCHESTRATION_ITERATIONS):
             use_tools = tool_calls_made < self.MAX_TOOL_CALLS
 
-            response = await client.chat.completions.create(
-                model=settings.openrouter_model,
-                messages=messages,
-                tools=OPENAI_TOOLS if use_tools else None,
-                tool_choice="auto" if use_tools else None,
-                timeout=45.0,
+            assistant_message, pending_searches = await self._call_with_backoff(
+                "openrouter",
+                lambda: self._stream_chat_turn(
+                    client, settings.openrouter_model, messages, use_tools
+                ),
             )
-
-            assistant_message = response.choices[0].message
-            has_tool_calls = bool(assistant_message.tool_calls)
-            response_text = assistant_message.content or ""
+            tool_calls = assistant_message.get("tool_calls", [])
+            has_tool_calls = bool(tool_calls)
+            response_text = assistant_message["content"] or ""
 
             state = await self._classify_response(response_text, has_tool_calls)
             logger.debug(
@@ -671,26 +1298,31 @@ User's question/comment: {query}"""
                 messages.append(assistant_message)
                 tool_calls_made += 1
 
-                for tool_call in assistant_message.tool_calls:
-                    if tool_call.function.name == "web_search":
-                        args = json.loads(tool_call.function.arguments)
-                        search_query = args.get("query", "")
-
-                        logger.info(
-                            f"OpenRouter tool call: web_search('{search_query}')"
-                        )
-                        search_results = await web_search_tool.search(search_query)
+                queries: dict[str, str] = {}
+                for tool_call in tool_calls:
+                    if tool_call["function"]["name"] == "web_search":
+                        args = orjson.loads(tool_call["function"]["arguments"])
+                        queries[tool_call["id"]] = args.get("query", "")
+                for search_query in queries.values():
+                    logger.info(
+                        f"OpenRouter tool call: web_search('{search_query}')"
+                    )
+                results_by_call = await _run_web_searches(queries, pending_searches)
 
+                for tool_call in tool_calls:
+                    if tool_call["id"] in results_by_call:
+                        search_results = results_by_call[tool_call["id"]]
                         for result in search_results:
                             sources_used.append(result["link"])
 
                         messages.append(
                             {
                                 "role": "tool",
-                                "tool_call_id": tool_call.id,
-                                "content": json.dumps(search_results),
+                                "tool_call_id": tool_call["id"],
+                                "content": orjson.dumps(search_results).decode(),
                             }
                         )
+                trim_tool_messages(messages, settings.openrouter_model)
 
             elif state == ResponseState.INTERMEDIARY:
                 logger.debug(f"Detected intermediary response: {response_text[:80]}...")
@@ -712,12 +1344,11 @@ User's question/comment: {query}"""
         logger.warning(
             "OpenRouter max orchestration iterations reached, forcing response"
         )
-        response = await client.chat.completions.create(
-            model=settings.openrouter_model,
-            messages=messages,
-            timeout=45.0,
+        response_text = await self._call_with_backoff(
+            "openrouter",
+            lambda: self._stream_completion(client, settings.openrouter_model, messages),
         )
-        return response.choices[0].message.content or "", sources_used
+        return response_text, sources_used
 
 
 # Singleton instance
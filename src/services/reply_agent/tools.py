@@ -4,21 +4,46 @@ import logging
 from typing import Optional
 
 import httpx
+import orjson
 
 from src.core.config import settings
+from src.core.http import get_http_client
+from src.services.reply_agent.models import SearchResult
+from src.utils.async_cache import AsyncTTLCache
 
 logger = logging.getLogger(__name__)
 
+# Upstream error bodies are logged only up to this many characters
+ERROR_BODY_LOG_CHARS = 512
+
 
 class WebSearchTool:
     """Google Custom Search implementation."""
 
     SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
 
-    async def search(self, query: str, num_results: int = 5) -> list[dict[str, str]]:
+    def __init__(self) -> None:
+        # Recent results by (query, num_results); repeated queries skip the API
+        self.cache: AsyncTTLCache[list[SearchResult]] = AsyncTTLCache(
+            maxsize=1024, ttl=600
+        )
+        # Credentials are fixed for the process, so they are read from settings
+        # and encoded once; each call only merges in its own query
+        self._configured = bool(
+            settings.google_search_api_key and settings.google_search_engine_id
+        )
+        self._base_params = httpx.QueryParams({
+            "key": settings.google_search_api_key,
+            "cx": settings.google_search_engine_id,
+        })
+
+    async def search(self, query: str, num_results: int = 5) -> list[SearchResult]:
         """
         Execute a web search using Google Custom Search API.
 
+        Results are cached for 10 minutes, and concurrent identical searches
+        share one API call. Failed (empty) searches are not cached.
+
         Args:
             query: Search query string
             num_results: Number of results to return (max 10)
@@ -26,44 +51,57 @@ class WebSearchTool:
         Returns:
             List of search results with title, link, snippet
         """
-        if not settings.google_search_api_key or not settings.google_search_engine_id:
+        return await self.cache.get_or_fetch(
+            (query, num_results),
+            lambda: self._search(query, num_results),
+            should_cache=bool,
+        )
+
+    async def _search(self, query: str, num_results: int) -> list[SearchResult]:
+        """Call the Google Custom Search API (uncached, see search)."""
+        if not self._configured:
             logger.warning("Google Search API not configured, returning empty results")
             return []
 
         try:
-            async with httpx.AsyncClient() as client:
-                params = {
-                    "key": settings.google_search_api_key,
-                    "cx": settings.google_search_engine_id,
-                    "q": query,
-                    "num": min(num_results, 10),
-                }
-
-                response = await client.get(self.SEARCH_URL, params=params, timeout=10.0)
-                response.raise_for_status()
-                data = response.json()
-
-                results = []
-                for item in data.get("items", []):
-                    results.append({
-                        "title": item.get("title", ""),
-                        "link": item.get("link", ""),
-                        "snippet": item.get("snippet", ""),
-                    })
-
-                logger.info(f"Search for '{query}' returned {len(results)} results")
-                return results
+            client = get_http_client()
+            params = self._base_params.merge({
+                "q": query,
+                "num": min(num_results, 10),
+            })
+
+            response = await client.get(self.SEARCH_URL, params=params, timeout=10.0)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+
+            results = [
+                SearchResult(
+                    item.get("title", ""), item.get("link", ""), item.get("snippet", "")
+                )
+                for item in data.get("items", [])
+            ]
+
+            logger.info("Search for '%s' returned %d results", query, len(results))
+            return results
 
         except httpx.HTTPStatusError as e:
-            logger.error(f"Google Search API error: {e.response.status_code} - {e.response.text}")
+            logger.error(
+                "Google Search API error: %s - %s",
+                e.response.status_code,
+                e.response.text[:ERROR_BODY_LOG_CHARS],
+            )
             return []
         except Exception as e:
-            logger.error(f"Web search failed: {e}")
+            logger.error("Web search failed: %s", e)
             return []
 
 
-# Tool definitions for LLM function calling
-OPENAI_TOOLS = [
+# Tool definitions for OpenAI-compatible function calling (Gemini's are built
+# in service.py as GEMINI_FUNCTION_TOOLS). Shared by every request, so it is a
+# tuple to keep callers from mutating it. The inner schemas stay plain dicts:
+# the OpenAI SDK passes free-form "parameters" straight to the JSON encoder,
+# which can't serialize read-only mapping proxies.
+OPENAI_TOOLS = (
     {
         "type": "function",
         "function": {
@@ -80,25 +118,8 @@ OPENAI_TOOLS = [
                 "required": ["query"],
             },
         },
-    }
-]
-
-GEMINI_TOOLS = [
-    {
-        "name": "web_search",
-        "description": "Search the web for current information. Use this when you need up-to-date information, recent news, or facts you're not certain about.",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "query": {
-                    "type": "string",
-                    "description": "The search query to look up",
-                }
-            },
-            "required": ["query"],
-        },
-    }
-]
+    },
+)
 
 
 # Singleton instance
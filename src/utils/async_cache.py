@@ -0,0 +1,86 @@
+"""TTL cache for async functions with in-flight request coalescing."""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncTTLCache(Generic[T]):
+    """
+    Time-bounded LRU cache in front of an async fetch.
+
+    A hit returns the stored value with no I/O. Concurrent misses for the
+    same key share one in-flight call instead of each issuing their own. If
+    the caller running that call is cancelled, the others retry rather than
+    being cancelled with it.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600):
+        self._cache: TTLCache[Hashable, T] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._inflight: dict[Hashable, asyncio.Future[T]] = {}
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[T]],
+        should_cache: Callable[[T], bool] = lambda value: True,
+    ) -> T:
+        """
+        Get a cached value, or fetch (once across concurrent callers) and cache it.
+
+        Args:
+            key: Cache key
+            fetch: Zero-argument coroutine function producing the value
+            should_cache: Whether a fetched value may be cached (e.g. skip
+                failures so they are retried on the next call)
+
+        Returns:
+            Cached or freshly fetched value
+        """
+        while True:
+            if key in self._cache:
+                return self._cache[key]
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise  # This caller was cancelled, not the shared fetch
+                # The caller running the fetch was cancelled; nothing cancelled
+                # this one, so fetch again (or join whoever got there first)
+
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await fetch()
+            if should_cache(value):
+                self._cache[key] = value
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Mark retrieved so asyncio doesn't warn when nobody else awaited it
+                future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a cached value so the next call fetches it again."""
+        self._cache.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all cached values."""
+        self._cache.clear()
@@ -1,54 +1,224 @@
 """Web scraping and external content fetching utilities."""
 
 import asyncio
+import codecs
+import functools
 import logging
+import re
 from typing import Optional
 
 import httpx
-from bs4 import BeautifulSoup
+import orjson
+
+from src.core.http import get_http_client
+from src.utils.async_cache import AsyncTTLCache
 
 logger = logging.getLogger(__name__)
 
 HN_BASE_URL = "https://hacker-news.firebaseio.com/v0"
+FETCH_TIMEOUT = 10.0
+
+# Pages are read up to this many bytes; the rest is never downloaded
+MAX_PAGE_BYTES = 2_000_000
+
+# Content types worth parsing; anything else (video, PDF, images...) is
+# skipped before its body is downloaded. A missing header is let through.
+TEXT_CONTENT_TYPES = ("html", "xml", "text/plain")
+
+# Pages larger than this are parsed in a worker thread (lxml releases the
+# GIL while parsing) so other fetches keep running on the event loop
+PARSE_OFFLOAD_BYTES = 256_000
+
+# Whitespace around line breaks; collapsing it strips lines and drops blank ones
+_WS_RE = re.compile(r"\s*\n\s*")
+
+# Charset declared in a <meta> tag or XML declaration, looked for in the
+# first META_SNIFF_BYTES of a page served without a charset in Content-Type
+META_SNIFF_BYTES = 4096
+_META_CHARSET_RE = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)"""
+    rb"""|<\?xml[^>]+encoding\s*=\s*["']([\w.:-]+)""",
+    re.IGNORECASE,
+)
+
+# Elements whose content is never readable text
+SKIPPED_TAGS = frozenset({"script", "style", "noscript", "svg"})
+
+# Extracted page text by URL
+page_cache: AsyncTTLCache[Optional[str]] = AsyncTTLCache(maxsize=1024, ttl=600)
+
+
+@functools.cache
+def _get_etree():
+    """Import lxml on first parse; processes that never scrape don't load it."""
+    from lxml import etree
+
+    return etree
+
+
+class _TextTarget:
+    """
+    lxml parser target that collects text while the document is tokenized.
+
+    No tree is built, and text inside SKIPPED_TAGS is dropped as it is read
+    instead of being materialized and removed afterwards. Every tag
+    boundary becomes a line break. Comments are ignored (no comment()
+    handler). Stateful, so use one per parse.
+    """
+
+    def __init__(self) -> None:
+        self.parts: list[str] = []
+        self.skip_depth = 0
+
+    def start(self, tag: str, attrib: dict) -> None:
+        if tag in SKIPPED_TAGS:
+            self.skip_depth += 1
+        elif not self.skip_depth:
+            self.parts.append("\n")
+
+    def end(self, tag: str) -> None:
+        if tag in SKIPPED_TAGS:
+            if self.skip_depth:
+                self.skip_depth -= 1
+        elif not self.skip_depth:
+            self.parts.append("\n")
+
+    def data(self, data: str) -> None:
+        if not self.skip_depth:
+            self.parts.append(data)
+
+    def close(self) -> str:
+        # One regex pass strips every line and drops the blank ones
+        return _WS_RE.sub("\n", "".join(self.parts)).strip()
+
+
+def _sniff_charset(html: bytes) -> Optional[str]:
+    """Get the charset a document declares in its head, if it names a known codec."""
+    match = _META_CHARSET_RE.search(html, 0, META_SNIFF_BYTES)
+    if match is None:
+        return None
+    charset = (match.group(1) or match.group(2)).decode("ascii")
+    try:
+        codecs.lookup(charset)
+    except LookupError:
+        return None
+    return charset
+
+
+def extract_text(html: str | bytes, encoding: Optional[str] = None) -> str:
+    """
+    Extract readable text from an HTML document.
+
+    Streams the document through lxml's C parser into a _TextTarget, so
+    no element tree is built and script/style/noscript/svg content is
+    discarded during tokenization. Returns one stripped line per
+    non-empty line of text.
+
+    Args:
+        html: HTML document; raw bytes are decoded by lxml itself
+        encoding: Charset of raw bytes (e.g. from Content-Type); if None,
+            the document's meta charset is used, else UTF-8 (libxml2's own
+            default would be latin-1)
+
+    Returns:
+        Cleaned text content
+    """
+    if not html.strip():
+        return ""
+
+    if isinstance(html, str):
+        # lxml rejects str input carrying an XML encoding declaration, so
+        # always hand it bytes
+        html, encoding = html.encode("utf-8"), "utf-8"
+    elif encoding is None:
+        encoding = _sniff_charset(html) or "utf-8"
+
+    etree = _get_etree()
+    try:
+        parser = etree.HTMLParser(target=_TextTarget(), encoding=encoding)
+    except LookupError:
+        # A charset Python knows but libxml2 doesn't
+        parser = etree.HTMLParser(target=_TextTarget(), encoding="utf-8")
+    return etree.fromstring(html, parser)
 
 
 async def fetch_page_text(url: str) -> Optional[str]:
     """
     Fetch and extract text content from a web page.
 
+    Pages are cached for 10 minutes, and concurrent fetches of the same URL
+    share one request. Failures are not cached.
+
     Args:
         url: URL of the web page to fetch
 
     Returns:
         Cleaned text content, or None if fetching fails
     """
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, follow_redirects=True)
-            response.raise_for_status()
+    return await page_cache.get_or_fetch(
+        url, lambda: _fetch_page_text(url), should_cache=lambda text: text is not None
+    )
 
-            # Parse HTML and extract text
-            soup = BeautifulSoup(response.text, "lxml")
 
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
+async def fetch_pages(urls: list[str], concurrency: int = 8) -> list[Optional[str]]:
+    """
+    Fetch and extract text from several pages concurrently.
 
-            # Get text content
-            text = soup.get_text(separator="\n", strip=True)
+    Args:
+        urls: URLs of the web pages to fetch
+        concurrency: Maximum number of pages fetched at once
 
-            # Clean up extra whitespace
-            lines = [line.strip() for line in text.split("\n") if line.strip()]
-            cleaned_text = "\n".join(lines)
+    Returns:
+        Cleaned text content per URL, in order; None where fetching failed
+    """
+    semaphore = asyncio.Semaphore(concurrency)
 
-            logger.info(f"Fetched {len(cleaned_text)} characters from {url}")
-            return cleaned_text
+    async def fetch_one(url: str) -> Optional[str]:
+        async with semaphore:
+            return await fetch_page_text(url)
+
+    return await asyncio.gather(*(fetch_one(url) for url in urls))
+
+
+async def _fetch_page_text(url: str) -> Optional[str]:
+    """Fetch and extract a page's text (uncached, see fetch_page_text)."""
+    try:
+        client = get_http_client()
+        # Stream so huge pages are cut off at MAX_PAGE_BYTES instead of being
+        # buffered and decoded whole; lxml decodes the raw bytes in C
+        async with client.stream(
+            "GET", url, follow_redirects=True, timeout=FETCH_TIMEOUT
+        ) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "").lower()
+            if content_type and not any(t in content_type for t in TEXT_CONTENT_TYPES):
+                logger.info("Skipping non-text page %s (%s)", url, content_type)
+                return None
+            chunks: list[bytes] = []
+            total = 0
+            async for chunk in response.aiter_bytes(65536):
+                chunks.append(chunk)
+                total += len(chunk)
+                if total >= MAX_PAGE_BYTES:
+                    logger.debug("Truncated %s at %d bytes", url, MAX_PAGE_BYTES)
+                    break
+            encoding = response.charset_encoding
+
+        body = b"".join(chunks)[:MAX_PAGE_BYTES]
+        if len(body) > PARSE_OFFLOAD_BYTES:
+            cleaned_text = await asyncio.to_thread(extract_text, body, encoding)
+        else:
+            cleaned_text = extract_text(body, encoding)
+
+        logger.info("Fetched %d characters from %s", len(cleaned_text), url)
+        return cleaned_text
 
     except httpx.HTTPStatusError as e:
-        logger.error(f"HTTP error fetching {url}: {e.response.status_code}")
+        # The body is never read on error (streamed), so only the status is logged
+        logger.error("HTTP error fetching %s: %s", url, e.response.status_code)
         return None
     except Exception as e:
-        logger.error(f"Failed to fetch page {url}: {e}")
+        logger.error("Failed to fetch page %s: %s", url, e)
         return None
 
 
@@ -61,11 +231,13 @@ async def _fetch_hn_story(
         Story dict with id, title, url, score, etc. or None on failure.
     """
     try:
-        response = await client.get(f"{HN_BASE_URL}/item/{item_id}.json")
+        response = await client.get(
+            f"{HN_BASE_URL}/item/{item_id}.json", timeout=FETCH_TIMEOUT
+        )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     except Exception as e:
-        logger.debug(f"Failed to fetch HN item {item_id}: {e}")
+        logger.debug("Failed to fetch HN item %s: %s", item_id, e)
         return None
 
 
@@ -84,52 +256,55 @@ async def fetch_hackernews_top_stories(count: int = 5) -> list[dict]:
         Empty list on failure.
     """
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # Get top story IDs
-            response = await client.get(f"{HN_BASE_URL}/topstories.json")
-            response.raise_for_status()
-            story_ids: list[int] = response.json()
-
-            if not story_ids:
-                logger.warning("HackerNews returned empty top stories list")
-                return []
-
-            # Fetch details for count*3 stories in parallel to find enough with URLs
-            batch_size = count * 3
-            batch_ids = story_ids[:batch_size]
-
-            stories_raw = await asyncio.gather(
-                *[_fetch_hn_story(client, sid) for sid in batch_ids]
-            )
-
-            # Filter for stories with external URLs
-            stories = []
-            for story in stories_raw:
-                if (
-                    story
-                    and story.get("type") == "story"
-                    and story.get("url")
-                ):
-                    stories.append(
-                        {
-                            "id": story["id"],
-                            "title": story.get("title", ""),
-                            "url": story["url"],
-                            "score": story.get("score", 0),
-                        }
-                    )
-                    if len(stories) >= count:
-                        break
-
-            logger.info(
-                f"Fetched {len(stories)} HN stories with URLs "
-                f"(from {len(batch_ids)} candidates)"
-            )
-            return stories
+        client = get_http_client()
+        # Get top story IDs
+        response = await client.get(
+            f"{HN_BASE_URL}/topstories.json", timeout=FETCH_TIMEOUT
+        )
+        response.raise_for_status()
+        story_ids: list[int] = orjson.loads(response.content)
+
+        if not story_ids:
+            logger.warning("HackerNews returned empty top stories list")
+            return []
+
+        # Fetch details for count*3 stories in parallel to find enough with URLs
+        batch_size = count * 3
+        batch_ids = story_ids[:batch_size]
+
+        stories_raw = await asyncio.gather(
+            *[_fetch_hn_story(client, sid) for sid in batch_ids]
+        )
+
+        # Filter for stories with external URLs
+        stories = []
+        for story in stories_raw:
+            if (
+                story
+                and story.get("type") == "story"
+                and story.get("url")
+            ):
+                stories.append(
+                    {
+                        "id": story["id"],
+                        "title": story.get("title", ""),
+                        "url": story["url"],
+                        "score": story.get("score", 0),
+                    }
+                )
+                if len(stories) >= count:
+                    break
+
+        logger.info(
+            "Fetched %d HN stories with URLs (from %d candidates)",
+            len(stories),
+            len(batch_ids),
+        )
+        return stories
 
     except httpx.HTTPStatusError as e:
-        logger.error(f"HackerNews API error: {e.response.status_code}")
+        logger.error("HackerNews API error: %s", e.response.status_code)
         return []
     except Exception as e:
-        logger.error(f"Failed to fetch HackerNews stories: {e}")
+        logger.error("Failed to fetch HackerNews stories: %s", e)
         return []
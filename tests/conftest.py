@@ -0,0 +1,6 @@
+"""Shared test setup."""
+
+import os
+
+# The Gemini key rotator refuses to import without a key
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
@@ -0,0 +1,64 @@
+"""Tests for the Reply Agent's OpenRouter fallback and circuit breaker."""
+
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from src.core.config import settings
+from src.llm.base import is_connection_error
+from src.services.reply_agent.service import ReplyAgentService
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def test_timeouts_and_connection_failures_are_connection_errors():
+    assert is_connection_error(openai.APITimeoutError(request=REQUEST))
+    assert is_connection_error(openai.APIConnectionError(request=REQUEST))
+    assert is_connection_error(httpx.ReadTimeout("timed out", request=REQUEST))
+    assert is_connection_error(httpx.ConnectError("refused", request=REQUEST))
+    assert is_connection_error(asyncio.TimeoutError())
+    assert not is_connection_error(ValueError("bad input"))
+
+
+@pytest.mark.asyncio
+async def test_primary_timeouts_fall_back_and_open_breaker(monkeypatch):
+    monkeypatch.setattr(settings, "llm_fallback_enabled", True)
+    monkeypatch.setattr(settings, "openrouter_api_key", "test-key")
+    agent = ReplyAgentService()
+    calls = []
+
+    async def call_provider(provider, full_prompt, *image_args):
+        calls.append(provider)
+        if provider == "openai":
+            raise openai.APITimeoutError(request=REQUEST)
+        return "fallback answer", []
+
+    monkeypatch.setattr(agent, "_call_provider", call_provider)
+
+    for _ in range(ReplyAgentService.BREAKER_FAILURE_THRESHOLD):
+        assert await agent._call_with_fallback("openai", "hi") == (
+            "fallback answer",
+            [],
+        )
+    assert calls.count("openai") == ReplyAgentService.BREAKER_FAILURE_THRESHOLD
+
+    # Breaker is open: the primary is skipped entirely
+    calls.clear()
+    assert await agent._call_with_fallback("openai", "hi") == ("fallback answer", [])
+    assert calls == ["openrouter"]
+
+
+@pytest.mark.asyncio
+async def test_timeouts_propagate_without_fallback(monkeypatch):
+    monkeypatch.setattr(settings, "llm_fallback_enabled", False)
+    agent = ReplyAgentService()
+
+    async def call_provider(provider, full_prompt, *image_args):
+        raise httpx.ReadTimeout("timed out", request=REQUEST)
+
+    monkeypatch.setattr(agent, "_call_provider", call_provider)
+
+    with pytest.raises(httpx.ReadTimeout):
+        await agent._call_with_fallback("openai", "hi")
@@ -0,0 +1,24 @@
+"""Tests for web page text extraction."""
+
+from src.utils.web_scraper import extract_text
+
+
+def test_headerless_utf8_page_defaults_to_utf8():
+    # No Content-Type charset and no <meta charset>; libxml2 alone would
+    # decode this as latin-1 and produce "line2 Â"
+    assert extract_text(b"<div> line2 \xc2\xa0 </div>") == "line2"
+    assert extract_text("<p>café 中文</p>".encode("utf-8")) == "café 中文"
+
+
+def test_meta_charset_is_honored_without_header():
+    html = '<html><head><meta charset="gbk"></head><body>中文</body></html>'
+    assert extract_text(html.encode("gbk")) == "中文"
+
+
+def test_header_charset_overrides_default():
+    assert extract_text("<p>café</p>".encode("latin-1"), "iso-8859-1") == "café"
+
+
+def test_script_and_style_text_is_dropped():
+    html = b"<p>keep</p><script>var x = 1;</script><style>p {}</style><p>this</p>"
+    assert extract_text(html) == "keep\nthis"